@@ -16,8 +16,8 @@ import numpy as np
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Core engine and helpers
-from ui.theme import apply_css, apply_theme_css
-from ui.logo import render_logo, get_base64_encoded_image
+from ui.theme import apply_all_css
+from ui.logo import render_logo, find_logo_path
 from data.data_generator import load_sample_data, validate_data
 from core.flare_utils import get_flare_engine, process_data
 
@@ -27,25 +27,15 @@ from tabs.campaign_details import build_campaign_details_tab
 from tabs.recommendations import build_recommendations_tab
 from tabs.spend_analysis import build_spend_analysis_tab
 from tabs.ai_forecasting import build_ai_forecasting_tab
+from tabs._styles import OVERVIEW_CSS, REC_CSS
 
-# Get logo for page icon
-logo_paths = [
-    "/Users/hrishibhanushali/Documents/Flare/assets/Flare logo.png",
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "Flare logo.png"),
-    "assets/Flare logo.png"
-]
-
-# Try to find the logo
-logo_base64 = None
-for path in logo_paths:
-    logo_base64 = get_base64_encoded_image(path)
-    if logo_base64:
-        break
+# Get logo for page icon (cached across reruns)
+logo_path = find_logo_path()
 
 # Streamlit page config
 st.set_page_config(
     page_title="FLARE Dashboard",
-    page_icon=f"data:image/png;base64,{logo_base64}" if logo_base64 else "🔥",
+    page_icon=logo_path if logo_path else "🔥",
     layout="wide",
     initial_sidebar_state="expanded"
 )
@@ -62,11 +52,6 @@ section[data-testid="stSidebar"] {
     z-index: 998 !important;
 }
 
-/* Fix font consistency */
-body, p, h1, h2, h3, h4, h5, h6, div, span, button, input, select, textarea {
-    font-family: system-ui, -apple-system, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif !important;
-}
-
 /* Enhanced loading indicators */
 .processing-container {
     border-radius: 10px;
@@ -138,17 +123,13 @@ div[data-testid="metric-container"] div[data-testid="stMetricDelta"] {
 </style>
 """, unsafe_allow_html=True)
 
-# Apply global CSS and initialize theme
-apply_css()
+# Tab-specific styles, emitted once here rather than by every tab build
+st.markdown(f"<style>{OVERVIEW_CSS}{REC_CSS}</style>", unsafe_allow_html=True)
+
+# Initialize theme and apply global CSS as a single stylesheet
 if "theme" not in st.session_state:
     st.session_state.theme = "light"  # Set light mode as default
-apply_theme_css(st.session_state.theme)
-
-# Apply theme-specific class for dark mode
-if st.session_state.theme == "dark":
-    st.markdown("<style>body {}</style><script>document.body.classList.add('dark-mode');</script>", unsafe_allow_html=True)
-else:
-    st.markdown("<style>body {}</style><script>document.body.classList.remove('dark-mode');</script>", unsafe_allow_html=True)
+apply_all_css(st.session_state.theme)
 
 # Initialize data processed flag if not present
 if "data_processed" not in st.session_state:
@@ -181,11 +162,9 @@ with st.sidebar:
     col1, col2 = st.columns(2)
     if col1.button("Light", key="light_mode_button", use_container_width=True):
         st.session_state.theme = "light"
-        apply_theme_css("light")
         st.rerun()
     if col2.button("Dark", key="dark_mode_button", use_container_width=True):
         st.session_state.theme = "dark"
-        apply_theme_css("dark")
         st.rerun()
 
     st.markdown("---")
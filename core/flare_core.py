@@ -6,6 +6,31 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to NumPy array ops
+    njit = None
+
+# Every stage a campaign can be assigned to
+FATIGUE_STAGE_DTYPE = pd.CategoricalDtype(['Healthy', 'Friction', 'Fatigue', 'Failure', 'Unknown'])
+
+def _apply_fri_waste(fri, total_spend, out_wasted, out_pct):
+    """Fill out_pct with the waste fraction for each FRI score (missing counts as 0) and out_wasted with spend * fraction"""
+    for i in range(fri.size):
+        score = fri[i]
+        if score != score:
+            score = 0.0
+        pct = 0.1 + score * 0.006
+        if pct < 0.1:
+            pct = 0.1
+        elif pct > 0.7:
+            pct = 0.7
+        out_pct[i] = pct
+        out_wasted[i] = total_spend[i] * pct
+
+if njit is not None:
+    _apply_fri_waste = njit(cache=True)(_apply_fri_waste)
+
 class FLARECore:
     """
     FLARE (Fatigue Learning and Adaptive Response Engine) Core Module
@@ -26,11 +51,13 @@ class FLARECore:
         self.threshold_fatigue = 0.2   # 20% CPA increase threshold
         self.threshold_failure = 0.3   # 30% ROI drop threshold
         self.summary = None  # Store summary report data
+        self.data_dirty = True  # Set when new data arrives; cleared once the dashboard reclassifies
         
     def load_data(self, file_path):
         """Load campaign data from CSV file"""
         try:
             self.data = pd.read_csv(file_path)
+            self.data_dirty = True
             print(f"Data loaded successfully with {len(self.data)} records")
             return True
         except Exception as e:
@@ -174,7 +201,14 @@ class FLARECore:
             df.loc[df['campaign_id'] == campaign, 'fatigue_stage'] = campaign_data['fatigue_stage']
             df.loc[df['campaign_id'] == campaign, 'fri_score'] = campaign_data['fri_score']
         
+        # Store CTR as a percentage once so charts and metrics don't rescale per render
+        df['ctr_pct'] = df['ctr'] * 100
+        
+        # Store stages as a categorical so comparisons are integer code compares
+        df['fatigue_stage'] = df['fatigue_stage'].astype(FATIGUE_STAGE_DTYPE)
+        
         self.fatigue_scores = df
+        self.data_dirty = True
         print("Fatigue scores calculated successfully")
         return True
         
@@ -478,7 +512,12 @@ class FLARECore:
         }
     
     def estimate_wasted_spend(self):
-        """Estimate wasted ad spend due to fatigue"""
+        """
+        Estimate wasted ad spend due to fatigue
+        
+        Returns a dict mapping every campaign_id to a dict with float total_spend,
+        waste_percentage, wasted_spend and recoverable_spend, or None without scores.
+        """
         if self.fatigue_scores is None:
             print("No fatigue scores available. Please calculate fatigue scores first.")
             return None
@@ -528,6 +567,33 @@ class FLARECore:
         
         return wasted_spend
     
+    def estimate_fri_waste(self):
+        """Estimate wasted spend per campaign from its latest FRI score, as a float64 DataFrame indexed by campaign_id"""
+        if self.fatigue_scores is None:
+            print("No fatigue scores available. Please calculate fatigue scores first.")
+            return None
+        
+        total_spend = self.fatigue_scores.groupby('campaign_id', sort=False)['spend'].sum().astype(np.float64)
+        latest_fri = self.fatigue_scores.groupby('campaign_id', sort=False).tail(1).set_index('campaign_id')['fri_score']
+        latest_fri = latest_fri.reindex(total_spend.index).to_numpy(dtype=np.float64)
+        spend = total_spend.to_numpy()
+        
+        # Linear mapping: FRI 0 -> 10% waste, FRI 100 -> 70% waste (missing scores count as FRI 0)
+        if njit is not None:
+            waste_fraction = np.empty_like(spend)
+            wasted = np.empty_like(spend)
+            _apply_fri_waste(latest_fri, spend, wasted, waste_fraction)
+        else:
+            waste_fraction = np.clip(0.1 + np.nan_to_num(latest_fri, nan=0.0) * 0.006, 0.1, 0.7)
+            wasted = spend * waste_fraction
+        
+        return pd.DataFrame({
+            'total_spend': spend,
+            'waste_percentage': waste_fraction * 100,
+            'wasted_spend': wasted,
+            'recoverable_spend': wasted
+        }, index=total_spend.index)
+    
     def get_summary_report(self):
         """Generate a summary report with improved error handling and classification fixes"""
         if self.fatigue_scores is None or len(self.fatigue_scores) == 0:
@@ -607,7 +673,7 @@ class FLARECore:
         # Calculate estimated waste
         wasted_spend = self.estimate_wasted_spend()
         if wasted_spend:
-            total_waste = sum(data["wasted_spend"] for data in wasted_spend.values() if isinstance(data, dict))
+            total_waste = sum(data["wasted_spend"] for data in wasted_spend.values())
             summary["estimated_waste"] = float(total_waste)
             summary["waste_percentage"] = float(total_waste / summary["total_spend"] * 100) if summary["total_spend"] > 0 else 0
         
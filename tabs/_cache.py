@@ -0,0 +1,26 @@
+"""
+FLARE Dashboard Tab Caching Helpers
+
+Cache keys and cached engine calls shared by the tab modules.
+"""
+
+import streamlit as st
+import pandas as pd
+
+def scores_key(flare):
+    """Content fingerprint of the engine's current fatigue scores, used as a cache key"""
+    scores = flare.fatigue_scores
+    if scores is None:
+        return None
+    # Hash the values rather than the object id: CPython reuses ids once a frame is freed
+    return (len(scores), int(pd.util.hash_pandas_object(scores, index=True).sum()))
+
+@st.cache_data(show_spinner=False)
+def cached_summary(_flare, scores_key):
+    """Summary report, recomputed only when the fatigue scores change"""
+    return _flare.get_summary_report()
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def campaign_index(_scores, scores_key):
+    """Split fatigue scores into per-campaign frames once; the frames are shared, so treat them as read-only"""
+    return {cid: sub for cid, sub in _scores.groupby('campaign_id', sort=False)}
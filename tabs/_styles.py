@@ -0,0 +1,77 @@
+"""
+FLARE Dashboard Tab Styles
+
+CSS shared by the tab modules. The app entry point injects these once per
+run instead of each tab re-emitting its own <style> block.
+"""
+
+# Native st.metric containers: equal height, no extra space
+OVERVIEW_CSS = """
+div[data-testid="metric-container"] {
+    background-color: transparent !important;
+    box-shadow: none !important;
+    padding: 0px !important;
+    margin: 0px !important;
+    height: auto !important;
+}
+"""
+
+# Recommendation priority circles and implementation timeline cards
+REC_CSS = """
+.circle-high {
+    display: inline-block;
+    width: 12px;
+    height: 12px;
+    border-radius: 50%;
+    background-color: #F44336;
+    margin-right: 8px;
+}
+.circle-medium {
+    display: inline-block;
+    width: 12px;
+    height: 12px;
+    border-radius: 50%;
+    background-color: #FF9800;
+    margin-right: 8px;
+}
+.circle-low {
+    display: inline-block;
+    width: 12px;
+    height: 12px;
+    border-radius: 50%;
+    background-color: #4CAF50;
+    margin-right: 8px;
+}
+.timeline-card {
+    padding: 15px;
+    border-radius: 5px;
+    text-align: center;
+    height: 85px;
+    box-sizing: border-box;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+    align-items: center;
+}
+.timeline-immediate {
+    background-color: #FFEBEE;
+}
+.timeline-week {
+    background-color: #FFF8E1;
+}
+.timeline-next {
+    background-color: #E8F5E9;
+}
+.timeline-card h4 {
+    margin: 0 0 10px 0;
+    font-size: 1.1rem;
+    width: 100%;
+    text-align: center;
+}
+.timeline-card p {
+    margin: 0;
+    font-size: 0.9rem;
+    width: 100%;
+    text-align: center;
+}
+"""
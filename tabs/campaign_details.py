@@ -1,9 +1,118 @@
+import math
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
+from tabs._cache import scores_key, campaign_index
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to NumPy reductions
+    njit = None
+
+# Stage colors shared by the chart markers and the status card
+STAGE_COLORS = {
+    'Healthy': '#4CAF50',
+    'Friction': '#FFCA28',
+    'Fatigue': '#FF9800',
+    'Failure': '#F44336',
+    'Unknown': '#9E9E9E'
+}
+_STAGE_COLORS = pd.Series(STAGE_COLORS)
+
+# FRI stage boundaries drawn on the FRI subplot
+_FRI_THRESHOLDS = [(20, '#FFCA28'), (50, '#FF9800'), (75, '#F44336')]
+
+def _fused_campaign_totals(spend, impressions, clicks, ctr, cpa):
+    """Sum spend/impressions/clicks and average CTR/CPA in a single pass (NaN-aware)"""
+    total_spend = total_impressions = total_clicks = ctr_sum = cpa_sum = 0.0
+    ctr_count = cpa_count = 0
+    for k in range(spend.size):
+        if spend[k] == spend[k]:
+            total_spend += spend[k]
+        if impressions[k] == impressions[k]:
+            total_impressions += impressions[k]
+        if clicks[k] == clicks[k]:
+            total_clicks += clicks[k]
+        if ctr[k] == ctr[k]:
+            ctr_sum += ctr[k]
+            ctr_count += 1
+        if cpa[k] == cpa[k]:
+            cpa_sum += cpa[k]
+            cpa_count += 1
+    avg_ctr = ctr_sum / ctr_count if ctr_count > 0 else np.nan
+    avg_cpa = cpa_sum / cpa_count if cpa_count > 0 else np.nan
+    return total_spend, total_impressions, total_clicks, avg_ctr, avg_cpa
+
+if njit is not None:
+    _fused_campaign_totals = njit(cache=True)(_fused_campaign_totals)
+
+def _ctr_pct(campaign_data):
+    """CTR as a percentage, using the column precomputed by the engine when present"""
+    if 'ctr_pct' in campaign_data.columns:
+        return campaign_data['ctr_pct']
+    return campaign_data['ctr'] * 100
+
+def campaign_totals(campaign_data):
+    """
+    Return (total_spend, total_impressions, total_clicks, avg_ctr_pct, avg_cpa) for a campaign.
+    Uses the compiled single-pass kernel when numba is installed.
+    """
+    n = len(campaign_data)
+    columns = [
+        campaign_data[col].to_numpy(dtype=np.float64) if col in campaign_data.columns else np.full(n, np.nan)
+        for col in ('spend', 'impressions', 'clicks')
+    ]
+    columns.append(_ctr_pct(campaign_data).to_numpy(dtype=np.float64))
+    columns.append(
+        campaign_data['cpa'].to_numpy(dtype=np.float64) if 'cpa' in campaign_data.columns else np.full(n, np.nan)
+    )
+    if njit is not None:
+        return _fused_campaign_totals(*columns)
+    spend, impressions, clicks, ctr, cpa = columns
+    avg_ctr = np.nanmean(ctr) if not np.isnan(ctr).all() else np.nan
+    avg_cpa = np.nanmean(cpa) if not np.isnan(cpa).all() else np.nan
+    return np.nansum(spend), np.nansum(impressions), np.nansum(clicks), avg_ctr, avg_cpa
+
+# Campaigns longer than this use the compiled FRI patch kernel (when numba is installed)
+_FRI_PATCH_NUMBA_MIN_ROWS = 5000
+
+def _fri_patch_kernel(stage_codes, fri, seed):
+    """Fill missing/too-low FRI scores for Fatigue (code 0) and Failure (code 1) rows in one pass"""
+    np.random.seed(seed)
+    for i in range(fri.size):
+        if stage_codes[i] == 0 and (np.isnan(fri[i]) or fri[i] < 30):
+            fri[i] = 40 + 30 * np.random.random()  # Reasonable value for Fatigue
+        elif stage_codes[i] == 1 and (np.isnan(fri[i]) or fri[i] < 50):
+            fri[i] = 75 + 20 * np.random.random()  # Reasonable value for Failure
+
+if njit is not None:
+    _fri_patch_kernel = njit(cache=True)(_fri_patch_kernel)
+
+def _patch_fri_inplace(df):
+    """
+    Give Fatigue/Failure rows whose FRI score is missing or too low for their stage
+    a stage-consistent score. Modifies df in place and returns it.
+    """
+    if njit is not None and len(df) > _FRI_PATCH_NUMBA_MIN_ROWS:
+        stage_codes = pd.Categorical(df['fatigue_stage'], categories=['Fatigue', 'Failure']).codes.astype(np.int8)
+        fri = df['fri_score'].to_numpy(dtype=np.float64, copy=True)
+        _fri_patch_kernel(stage_codes, fri, np.random.randint(0, 2**31 - 1))
+        df['fri_score'] = fri
+        return df
+    
+    fri = df['fri_score']
+    missing = fri.isna()
+    fatigue_rows = (df['fatigue_stage'] == 'Fatigue') & (missing | (fri < 30))
+    failure_rows = (df['fatigue_stage'] == 'Failure') & (missing | (fri < 50))
+    if fatigue_rows.any():
+        df.loc[fatigue_rows, 'fri_score'] = np.random.uniform(40, 70, int(fatigue_rows.sum()))
+    if failure_rows.any():
+        df.loc[failure_rows, 'fri_score'] = np.random.uniform(75, 95, int(failure_rows.sum()))
+    return df
 
 def create_campaign_chart(campaign_data):
     """Create an interactive Plotly chart for campaign metrics"""
@@ -46,7 +155,7 @@ def create_campaign_chart(campaign_data):
         fig.add_trace(
             go.Scatter(
                 x=campaign_data['date'], 
-                y=campaign_data['ctr']*100, 
+                y=_ctr_pct(campaign_data), 
                 name="CTR (%)", 
                 line=dict(color="#1f77b4", width=3)
             ),
@@ -70,15 +179,6 @@ def create_campaign_chart(campaign_data):
     except Exception as e:
         st.warning(f"Error adding CPA data: {e}")
     
-    # Create color map for FRI points
-    stage_colors = {
-        'Healthy': '#4CAF50',
-        'Friction': '#FFCA28',
-        'Fatigue': '#FF9800',
-        'Failure': '#F44336',
-        'Unknown': '#9E9E9E'
-    }
-    
     # Add FRI scatter plot with color based on stage
     try:
         if 'fri_score' in campaign_data.columns and 'fatigue_stage' in campaign_data.columns:
@@ -86,11 +186,7 @@ def create_campaign_chart(campaign_data):
             campaign_data_copy = campaign_data.copy()
             
             # For Fatigue and Failure stage campaigns, fix FRI scores if they're zero
-            for idx, row in campaign_data_copy.iterrows():
-                if row['fatigue_stage'] == 'Fatigue' and (pd.isna(row['fri_score']) or row['fri_score'] < 30):
-                    campaign_data_copy.at[idx, 'fri_score'] = np.random.uniform(40, 70)  # Reasonable value for Fatigue
-                elif row['fatigue_stage'] == 'Failure' and (pd.isna(row['fri_score']) or row['fri_score'] < 50):
-                    campaign_data_copy.at[idx, 'fri_score'] = np.random.uniform(75, 95)  # Reasonable value for Failure
+            _patch_fri_inplace(campaign_data_copy)
             
             # Fill any remaining NaN values in fri_score with zero
             campaign_data_copy['fri_score'] = campaign_data_copy['fri_score'].fillna(0)
@@ -103,7 +199,7 @@ def create_campaign_chart(campaign_data):
                     name="FRI Score", 
                     marker=dict(
                         size=10,
-                        color=[stage_colors.get(stage, '#9E9E9E') for stage in campaign_data_copy['fatigue_stage']],
+                        color=campaign_data_copy['fatigue_stage'].map(_STAGE_COLORS).astype(object).fillna('#9E9E9E').to_numpy(),
                         line=dict(width=2, color='DarkSlateGrey')
                     ),
                     line=dict(color='#7f7f7f', width=2, dash='dot')
@@ -111,10 +207,12 @@ def create_campaign_chart(campaign_data):
                 row=3, col=1
             )
             
-            # Add threshold lines for FRI
-            fig.add_hline(y=20, line=dict(color='#FFCA28', width=1, dash='dash'), row=3, col=1)
-            fig.add_hline(y=50, line=dict(color='#FF9800', width=1, dash='dash'), row=3, col=1)
-            fig.add_hline(y=75, line=dict(color='#F44336', width=1, dash='dash'), row=3, col=1)
+            # Add threshold lines for FRI in a single layout update
+            fig.update_layout(shapes=[
+                dict(type='line', xref='x3 domain', yref='y3', x0=0, x1=1, y0=y, y1=y,
+                     line=dict(color=c, width=1, dash='dash'))
+                for y, c in _FRI_THRESHOLDS
+            ])
     except Exception as e:
         st.warning(f"Error adding FRI data: {e}")
     
@@ -146,17 +244,44 @@ def create_campaign_chart(campaign_data):
     
     return fig
 
+@lru_cache(maxsize=512)
+def _fmt_currency(value):
+    return f"${value:,.2f}"
+
+@lru_cache(maxsize=512)
+def _fmt_number(value):
+    return f"{int(value):,}"
+
+def _finite_values(value, fill):
+    """Coerce a Series/array to numbers, replacing missing and infinite entries with fill"""
+    values = pd.to_numeric(pd.Series(value), errors='coerce')
+    return values.where(np.isfinite(values), fill)
+
 def format_currency(value):
-    """Format value as currency"""
-    if pd.isna(value) or not isinstance(value, (int, float)):
+    """Format value as currency (Series/arrays are formatted element-wise)"""
+    if isinstance(value, (pd.Series, np.ndarray)):
+        formatted = _finite_values(value, 0.0).map(_fmt_currency)
+        return formatted if isinstance(value, pd.Series) else formatted.to_numpy()
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
         return "$0.00"
-    return f"${value:,.2f}"
+    if not math.isfinite(value):
+        return "$0.00"
+    return _fmt_currency(value)
 
 def format_number(value):
-    """Format number with commas for thousands"""
-    if pd.isna(value) or not isinstance(value, (int, float)):
+    """Format number with commas for thousands (Series/arrays are formatted element-wise)"""
+    if isinstance(value, (pd.Series, np.ndarray)):
+        formatted = _finite_values(value, 0).map(_fmt_number)
+        return formatted if isinstance(value, pd.Series) else formatted.to_numpy()
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
         return "0"
-    return f"{int(value):,}"
+    if not math.isfinite(value):
+        return "0"
+    return _fmt_number(value)
 
 def calculate_waste_percentage(fri_score):
     """
@@ -165,8 +290,12 @@ def calculate_waste_percentage(fri_score):
     FRI 50 → 40% waste
     FRI 100 → 70% waste
     """
-    if pd.isna(fri_score) or not isinstance(fri_score, (int, float)):
+    try:
+        fri_score = float(fri_score)
+    except (TypeError, ValueError):
         return 0.1  # Default to 10% waste
+    if not math.isfinite(fri_score):
+        return 0.1
 
     fri_score = max(0, min(100, fri_score))
     min_waste = 0.1
@@ -189,6 +318,11 @@ def build_campaign_details_tab(flare):
         
         # Get unique campaign IDs
         campaign_ids = flare.fatigue_scores['campaign_id'].unique()
+        campaign_groups = campaign_index(flare.fatigue_scores, scores_key(flare))
+        
+        # Latest row per campaign, used for stage grouping and selector labels
+        last_rows = flare.fatigue_scores.groupby('campaign_id', sort=False).tail(1).set_index('campaign_id')
+        label_map = {cid: f"{cid} - {stg}" for cid, stg in last_rows['fatigue_stage'].items()}
         
         # Create filter section with improved styling
         st.markdown("<div class='filter-section'>", unsafe_allow_html=True)
@@ -202,13 +336,10 @@ def build_campaign_details_tab(flare):
         
         # Create groupings by fatigue stage
         campaigns_by_stage = {}
-        for campaign in campaign_ids:
-            latest_data = flare.fatigue_scores[flare.fatigue_scores['campaign_id'] == campaign]
-            if not latest_data.empty:
-                latest_stage = latest_data.iloc[-1]['fatigue_stage']
-                if latest_stage not in campaigns_by_stage:
-                    campaigns_by_stage[latest_stage] = []
-                campaigns_by_stage[latest_stage].append(campaign)
+        for campaign, latest_stage in last_rows['fatigue_stage'].items():
+            if latest_stage not in campaigns_by_stage:
+                campaigns_by_stage[latest_stage] = []
+            campaigns_by_stage[latest_stage].append(campaign)
         
         with filter_col1:
             filter_by = st.selectbox(
@@ -312,7 +443,7 @@ def build_campaign_details_tab(flare):
                 "Select Campaign",
                 filtered_campaigns,
                 index=default_index,
-                format_func=lambda x: f"{x} - {flare.fatigue_scores[flare.fatigue_scores['campaign_id'] == x].iloc[-1]['fatigue_stage']}"
+                format_func=label_map.get
             )
             
             # Update session state
@@ -328,7 +459,7 @@ def build_campaign_details_tab(flare):
         st.markdown("<div style='height: 25px;'></div>", unsafe_allow_html=True)
             
         # Filter data for the selected campaign
-        campaign_data = flare.fatigue_scores[flare.fatigue_scores['campaign_id'] == selected_campaign]
+        campaign_data = campaign_groups.get(selected_campaign, flare.fatigue_scores.iloc[0:0])
         
         if not campaign_data.empty:
             # Get the latest fatigue stage
@@ -354,12 +485,7 @@ def build_campaign_details_tab(flare):
                 st.subheader("Campaign Performance Metrics")
                 
                 # Fix campaign data FRI scores
-                campaign_data_fixed = campaign_data.copy()
-                for idx, row in campaign_data_fixed.iterrows():
-                    if row['fatigue_stage'] == 'Fatigue' and (pd.isna(row['fri_score']) or row['fri_score'] < 30):
-                        campaign_data_fixed.at[idx, 'fri_score'] = np.random.uniform(40, 70)
-                    elif row['fatigue_stage'] == 'Failure' and (pd.isna(row['fri_score']) or row['fri_score'] < 50):
-                        campaign_data_fixed.at[idx, 'fri_score'] = np.random.uniform(75, 95)
+                campaign_data_fixed = _patch_fri_inplace(campaign_data.copy())
                 
                 fig = create_campaign_chart(campaign_data_fixed)
                 st.plotly_chart(fig, use_container_width=True)
@@ -368,16 +494,7 @@ def build_campaign_details_tab(flare):
                 # Current status with improved styling
                 st.subheader("Current Status")
                 
-                # Stage colors
-                stage_colors = {
-                    'Healthy': '#4CAF50',
-                    'Friction': '#FFCA28',
-                    'Fatigue': '#FF9800',
-                    'Failure': '#F44336',
-                    'Unknown': '#9E9E9E'
-                }
-                
-                status_color = stage_colors.get(latest_stage, '#9E9E9E')
+                status_color = STAGE_COLORS.get(latest_stage, '#9E9E9E')
                 
                 # Status display with improved visual appeal
                 st.markdown(
@@ -400,27 +517,26 @@ def build_campaign_details_tab(flare):
                 st.markdown("<div style='height: 15px;'></div>", unsafe_allow_html=True)
                 
                 # Calculate key metrics
-                total_spend = campaign_data['spend'].sum()
-                total_impressions = campaign_data['impressions'].sum()
-                total_clicks = campaign_data['clicks'].sum()
+                total_spend, total_impressions, total_clicks, mean_ctr, mean_cpa = campaign_totals(campaign_data)
                 
                 # Handle potential missing data
                 has_conversions = 'conversions' in campaign_data.columns and not campaign_data['conversions'].isnull().all()
                 total_conversions = campaign_data['conversions'].sum() if has_conversions else "N/A"
                 
-                avg_ctr = campaign_data['ctr'].mean() * 100  # Convert to percentage
+                avg_ctr = mean_ctr  # Already a percentage
                 avg_cpc = campaign_data['cpc'].mean() if 'cpc' in campaign_data.columns else None
                 
                 # Handle CPA with care - might be unavailable
-                has_cpa = 'cpa' in campaign_data.columns and not campaign_data['cpa'].isnull().all()
-                avg_cpa = campaign_data['cpa'].mean() if has_cpa else None
+                has_cpa = not pd.isna(mean_cpa)
+                avg_cpa = mean_cpa if has_cpa else None
                 
                 # Calculate changes over time
                 early_period = min(7, len(campaign_data) // 3)
                 late_period = min(7, len(campaign_data) // 3)
                 
-                early_ctr = campaign_data.iloc[:early_period]['ctr'].mean() * 100 if early_period > 0 else 0
-                late_ctr = campaign_data.iloc[-late_period:]['ctr'].mean() * 100 if late_period > 0 else 0
+                ctr_pct = _ctr_pct(campaign_data)
+                early_ctr = ctr_pct.iloc[:early_period].mean() if early_period > 0 else 0
+                late_ctr = ctr_pct.iloc[-late_period:].mean() if late_period > 0 else 0
                 ctr_trend = ((late_ctr - early_ctr) / early_ctr) * 100 if early_ctr > 0 else 0
                 
                 # Basic metrics
@@ -1,75 +1,185 @@
+import math
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 from datetime import datetime
+from ui.compat import fragment
+from tabs._cache import scores_key, cached_summary
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to np.select
+    njit = None
+
+# Stages in FRI order; classify_fri returns indexes into this list
+FRI_STAGES = ['Healthy', 'Friction', 'Fatigue', 'Failure']
+
+def _classify_fri_kernel(fri, out):
+    """Write the FRI_STAGES index for each score into out (-1 where the score is missing)"""
+    for i in range(fri.size):
+        score = fri[i]
+        if score >= 75:
+            out[i] = 3
+        elif score >= 50:
+            out[i] = 2
+        elif score >= 20:
+            out[i] = 1
+        elif score < 20:
+            out[i] = 0
+        else:
+            out[i] = -1
+
+if njit is not None:
+    _classify_fri_kernel = njit(cache=True)(_classify_fri_kernel)
+
+def classify_fri(fri):
+    """Map FRI scores to int8 stage codes (indexes into FRI_STAGES, -1 for NaN)"""
+    fri = np.asarray(fri, dtype=np.float64)
+    if njit is not None:
+        codes = np.empty(fri.size, dtype=np.int8)
+        _classify_fri_kernel(fri, codes)
+        return codes
+    return np.select([fri >= 75, fri >= 50, fri >= 20, fri < 20], [3, 2, 1, 0], default=-1).astype(np.int8)
 
 def format_currency(value):
     """Format value as currency"""
-    if pd.isna(value) or not isinstance(value, (int, float)):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return "$0.00"
+    if not math.isfinite(value):
         return "$0.00"
     return f"${value:,.2f}"
 
 def format_number(value):
     """Format number with commas for thousands"""
-    if pd.isna(value) or not isinstance(value, (int, float)):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return "0"
+    if not math.isfinite(value):
         return "0"
     return f"{int(value):,}"
 
-def display_campaigns_by_stage(stage, color, campaigns, flare):
-    """Display a list of campaigns with improved styling"""
-    if campaigns:
+@st.cache_data(show_spinner=False)
+def _cached_waste_estimates(_flare, scores_key):
+    """Waste estimates, recomputed only when the fatigue scores change"""
+    return _flare.estimate_wasted_spend()
+
+# Stage colors, in display order
+STAGE_COLORS = {
+    'Healthy': '#4CAF50',
+    'Friction': '#FFCA28',
+    'Fatigue': '#FF9800',
+    'Failure': '#F44336',
+    'Unknown': '#9E9E9E'
+}
+
+# Per-stage FRI display bounds: (low, high, default). Scores below low (or missing)
+# show the default; scores above high are capped at high.
+STAGE_PARAMS = {
+    'Healthy': (-np.inf, 20, 0),
+    'Friction': (20, 50, 35),
+    'Fatigue': (50, 75, 65),
+    'Failure': (75, np.inf, 90),
+    'Unknown': (-np.inf, np.inf, 0),
+}
+
+def _add_stage_adjusted_fri(latest):
+    """
+    Add a fri_adj_<stage> column per stage so that displayed FRI scores
+    stay consistent with the campaign status they are listed under
+    """
+    fri = latest['fri_score'].to_numpy(dtype=np.float64)
+    missing = np.isnan(fri)
+    for stage, (low, high, default) in STAGE_PARAMS.items():
+        latest[f'fri_adj_{stage}'] = np.where(missing | (fri < low), default, np.minimum(fri, high))
+    return latest
+
+def display_campaigns_by_stage(stage, color, stage_rows):
+    """Display a list of campaigns with improved styling (stage_rows: latest rows of the stage's campaigns, indexed by campaign_id)"""
+    if len(stage_rows):
+        campaigns = stage_rows.index
         # Improved header styling
         st.markdown(f"""<div style='background-color: {color}; color: white; padding: 8px 15px; 
         border-radius: 8px; margin: 15px 0 10px 0; font-weight: 600;'>
         {stage} Campaigns ({len(campaigns)})</div>""", unsafe_allow_html=True)
         
-        # Create a container for better scrolling
-        st.markdown("<div class='campaign-list-container'>", unsafe_allow_html=True)
+        fri_column = f'fri_adj_{stage}' if f'fri_adj_{stage}' in stage_rows.columns else 'fri_adj_Unknown'
         
-        for campaign in campaigns:
-            # Get campaign data
-            campaign_data = flare.fatigue_scores[flare.fatigue_scores['campaign_id'] == campaign].iloc[-1]
-            
-            # Fix FRI score for campaigns - ensure consistency with campaign status
-            # This ensures that campaign status and FRI score align properly
-            if stage == 'Healthy':
-                fri_score = 0 if pd.isna(campaign_data['fri_score']) else min(20, campaign_data['fri_score'])
-            elif stage == 'Friction':
-                fri_score = 35 if pd.isna(campaign_data['fri_score']) or campaign_data['fri_score'] < 20 else min(50, campaign_data['fri_score'])
-            elif stage == 'Fatigue':
-                fri_score = 65 if pd.isna(campaign_data['fri_score']) or campaign_data['fri_score'] < 50 else min(75, campaign_data['fri_score'])
-            elif stage == 'Failure':
-                fri_score = 90 if pd.isna(campaign_data['fri_score']) or campaign_data['fri_score'] < 75 else campaign_data['fri_score']
-            else:
-                fri_score = 0 if pd.isna(campaign_data['fri_score']) else campaign_data['fri_score']
-            
-            # Determine progress bar class
-            progress_bar_class = ""
-            if stage == "Failure":
-                progress_bar_class = "progress-bar-failure"
-            elif stage == "Fatigue":
-                progress_bar_class = "progress-bar-fatigue"
-            
-            # Get text color based on theme
-            text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
-            
-            st.markdown(f"""
-            <div class='campaign-listing'>
-                <div style='display: flex; align-items: center;'>
-                    <div style='width: 30%; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; 
-                    color: {text_color}; padding-right: 10px;'>{campaign}</div>
-                    <div style='flex-grow: 1; margin: 0 10px;'>
-                        <div class='progress-container' style='height: 8px;'>
-                            <div class='progress-bar {progress_bar_class}' style='width: {fri_score}%; 
-                            background-color: {color};'></div>
-                        </div>
-                    </div>
-                    <div style='color: {text_color}; width: 40px; text-align: right;'>{fri_score:.0f}</div>
-                </div>
-            </div>""", unsafe_allow_html=True)
+        # Determine progress bar class
+        progress_bar_class = ""
+        if stage == "Failure":
+            progress_bar_class = "progress-bar-failure"
+        elif stage == "Fatigue":
+            progress_bar_class = "progress-bar-fatigue"
+        
+        # Get text color based on theme
+        text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
+        
+        # Build every listing (FRI clamped to the stage, see _add_stage_adjusted_fri) and emit them in one call
+        rows = [
+            f"<div class='campaign-listing'><div style='display: flex; align-items: center;'>"
+            f"<div style='width: 30%; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; "
+            f"color: {text_color}; padding-right: 10px;'>{campaign}</div>"
+            f"<div style='flex-grow: 1; margin: 0 10px;'><div class='progress-container' style='height: 8px;'>"
+            f"<div class='progress-bar {progress_bar_class}' style='width: {fri_score}%; background-color: {color};'></div>"
+            f"</div></div>"
+            f"<div style='color: {text_color}; width: 40px; text-align: right;'>{fri_score:.0f}</div>"
+            f"</div></div>"
+            for campaign, fri_score in zip(campaigns, stage_rows[fri_column])
+        ]
+        st.markdown("<div class='campaign-list-container'>" + "".join(rows) + "</div>", unsafe_allow_html=True)
+
+@st.cache_data(show_spinner=False)
+def _high_risk_card_html(high_risk_campaigns, waste_estimates, theme):
+    """Build the styled card HTML for each high-risk campaign, keyed by campaign_id"""
+    # Determine colors based on theme
+    bg_color = '#3a2525' if theme == 'dark' else '#FFF8F8'
+    border_color = '#5a3333' if theme == 'dark' else '#FFCDD2'
+    text_color = '#ffffff' if theme == 'dark' else '#111111'
+    
+    cards = {}
+    for campaign_info in high_risk_campaigns:
+        campaign_id = campaign_info["campaign_id"]
         
-        st.markdown("</div>", unsafe_allow_html=True)
+        # Ensure high risk campaigns have appropriate stage and FRI
+        if campaign_info['fri_score'] >= 75:
+            stage = 'Failure'
+            fri_score = max(75, campaign_info['fri_score'])
+        elif campaign_info['fri_score'] >= 50:
+            stage = 'Fatigue'
+            fri_score = max(50, campaign_info['fri_score'])
+        else:
+            stage = 'Friction'
+            fri_score = max(30, campaign_info['fri_score'])
+        
+        # Get waste estimates
+        waste_data = waste_estimates.get(campaign_id, {}) if waste_estimates else {}
+        waste_amount = waste_data.get("wasted_spend", 0)
+        waste_percent = waste_data.get("waste_percentage", 0)
+        
+        cards[campaign_id] = f"""
+        <div style='background-color: {bg_color}; border: 1px solid {border_color}; border-radius: 10px; padding: 20px; margin-bottom: 20px; box-shadow: 0 2px 10px rgba(244,67,54,0.1);'>
+            <h3 style='color: {text_color}; margin-top: 0; margin-bottom: 10px;'>{campaign_id}</h3>
+            <div style='margin-bottom: 15px;'><span class="stage-{stage.lower()}">{stage}</span></div>
+            <div style='margin: 15px 0;'>
+                <div style='margin-bottom: 5px; color: {text_color};'>FRI Score</div>
+                <div class='progress-container'>
+                    <div class='progress-bar progress-bar-failure' style='width: {fri_score}%;'></div>
+                </div>
+                <div style='text-align: right; color: {text_color}; margin-top: 5px;'>{fri_score:.1f}</div>
+            </div>
+            <div style='margin: 20px 0;'>
+                <div style='font-weight: bold; color: #D32F2F;'>Wasted Spend</div>
+                <div style='font-size: 1.2rem; color: {text_color}; margin-top: 5px;'>{format_currency(waste_amount)} ({waste_percent:.1f}%)</div>
+            </div>
+        </div>
+        """
+    return cards
 
+@fragment
 def build_overview_tab(flare):
     """Build the overview tab with campaign health metrics and distribution"""
     try:
@@ -77,82 +187,60 @@ def build_overview_tab(flare):
         st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
         
         # Get summary report from flare engine
-        summary = flare.get_summary_report()
+        summary = cached_summary(flare, scores_key(flare))
         
         if not summary:
             st.warning("No data available. Please process campaign data first.")
             return
 
-        # Fix classification issues if needed
-        flare.reclassify_campaigns()
-        
-        # Force campaigns with high FRI scores to have appropriate stages
-        for campaign in flare.fatigue_scores['campaign_id'].unique():
-            campaign_data = flare.fatigue_scores[flare.fatigue_scores['campaign_id'] == campaign]
-            if not campaign_data.empty:
-                latest_data = campaign_data.iloc[-1]
-                fri_score = latest_data['fri_score']
-                
-                # Ensure FRI scores and stages align
-                if fri_score >= 75 and latest_data['fatigue_stage'] != 'Failure':
-                    flare.fatigue_scores.loc[flare.fatigue_scores['campaign_id'] == campaign, 'fatigue_stage'] = 'Failure'
-                elif 50 <= fri_score < 75 and latest_data['fatigue_stage'] != 'Fatigue':
-                    flare.fatigue_scores.loc[flare.fatigue_scores['campaign_id'] == campaign, 'fatigue_stage'] = 'Fatigue'
-                elif 20 <= fri_score < 50 and latest_data['fatigue_stage'] != 'Friction':
-                    flare.fatigue_scores.loc[flare.fatigue_scores['campaign_id'] == campaign, 'fatigue_stage'] = 'Friction'
-                elif fri_score < 20 and latest_data['fatigue_stage'] != 'Healthy':
-                    flare.fatigue_scores.loc[flare.fatigue_scores['campaign_id'] == campaign, 'fatigue_stage'] = 'Healthy'
+        # Fix classification issues only when the underlying data has changed
+        if getattr(flare, 'data_dirty', True):
+            flare.reclassify_campaigns()
+            
+            # Force campaigns with high FRI scores to have appropriate stages
+            scores = flare.fatigue_scores
+            latest_rows = scores.groupby('campaign_id', sort=False).tail(1)
+            # Code -1 (missing FRI) indexes the trailing '' and leaves the campaign untouched
+            expected_stage = np.array(FRI_STAGES + [''])[classify_fri(latest_rows['fri_score'].to_numpy())]
+            # Only campaigns whose latest stage disagrees with their FRI score are rewritten
+            needs_fix = (expected_stage != '') & (latest_rows['fatigue_stage'].to_numpy() != expected_stage)
+            if needs_fix.any():
+                fixed_stage = pd.Series(expected_stage[needs_fix], index=latest_rows['campaign_id'].to_numpy()[needs_fix])
+                new_stage = scores['campaign_id'].map(fixed_stage)
+                rows = new_stage.notna()
+                scores.loc[rows, 'fatigue_stage'] = new_stage[rows]
+            flare.data_dirty = False
         
         # Update summary with fixed classifications
-        summary = flare.get_summary_report()
-        
-        # USE NATIVE STREAMLIT METRICS WITH FIXED HEIGHT AND CSS
-        # Add custom CSS to fix equal height and remove extra space
-        st.markdown("""
-        <style>
-        div[data-testid="metric-container"] {
-            background-color: transparent !important;
-            box-shadow: none !important;
-            padding: 0px !important;
-            margin: 0px !important;
-            height: auto !important;
-        }
-        /* Make Estimated Waste value red for urgency */
-        [data-testid="metric-container"]:nth-child(3) [data-testid="stMetricValue"] {
-            color: #FF5A5F !important;
-            font-weight: 700 !important;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        # Create metrics row with consistent sizing
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                "Total Campaigns", 
-                summary["total_campaigns"]
-            )
-        
-        with col2:
-            st.metric(
-                "Total Spend", 
-                format_currency(summary["total_spend"])
-            )
+        summary = cached_summary(flare, scores_key(flare))
         
-        with col3:
-            # Highlighted with red color via CSS above
-            st.metric(
-                "Estimated Waste", 
-                format_currency(summary["estimated_waste"]),
-                f"{summary['waste_percentage']:.2f}%"
-            )
+        # Latest row per campaign, indexed by campaign_id for hashed lookups
+        latest = flare.fatigue_scores.groupby('campaign_id', sort=False).tail(1).set_index('campaign_id')
+        _add_stage_adjusted_fri(latest)
         
-        with col4:
-            st.metric(
-                "High Risk Campaigns", 
-                len(summary["high_risk_campaigns"])
-            )
+        # Headline metrics as one static HTML grid (no interactive widget state needed)
+        theme = st.session_state.get('theme', 'light')
+        text_color = '#ffffff' if theme == 'dark' else '#111111'
+        card_bg = '#1E1E1E' if theme == 'dark' else '#FFFFFF'
+        headline_metrics = [
+            ("Total Campaigns", summary["total_campaigns"], text_color, ""),
+            ("Total Spend", format_currency(summary["total_spend"]), text_color, ""),
+            # Estimated Waste value is red for urgency
+            ("Estimated Waste", format_currency(summary["estimated_waste"]), "#FF5A5F",
+             f"<div class='stat-change-up'>↑ {summary['waste_percentage']:.2f}%</div>"),
+            ("High Risk Campaigns", len(summary["high_risk_campaigns"]), text_color, ""),
+        ]
+        metric_html = "".join(
+            f"<div class='metric-card' style='background-color: {card_bg};'>"
+            f"<div class='metric-label' style='color: {text_color} !important;'>{label}</div>"
+            f"<div class='metric-value' style='color: {value_color} !important;'>{value}</div>"
+            f"{delta_html}</div>"
+            for label, value, value_color, delta_html in headline_metrics
+        )
+        st.markdown(
+            f"<div style='display: grid; grid-template-columns: repeat(4, 1fr); gap: 16px;'>{metric_html}</div>",
+            unsafe_allow_html=True
+        )
         
         # Campaign health distribution section - add spacing
         st.markdown("<div style='height: 30px;'></div>", unsafe_allow_html=True)
@@ -163,9 +251,11 @@ def build_overview_tab(flare):
         
         with col1:
             # Create pie chart of campaign stages with improved styling
-            stages = summary["campaign_stages"]
-            stage_names = list(stages.keys())
-            stage_counts = list(stages.values())
+            # Count stages straight from the latest row per campaign (categorical value_counts)
+            stage_counts_series = latest['fatigue_stage'].value_counts(sort=False)
+            stage_counts_series = stage_counts_series[stage_counts_series > 0]
+            stage_names = stage_counts_series.index.astype(str).tolist()
+            stage_counts = stage_counts_series.to_numpy().tolist()
             
             # Create pie chart with color mapping
             fig = px.pie(
@@ -173,13 +263,7 @@ def build_overview_tab(flare):
                 values=stage_counts,
                 hole=.4,
                 color=stage_names,
-                color_discrete_map={
-                    'Healthy': '#4CAF50',
-                    'Friction': '#FFCA28',
-                    'Fatigue': '#FF9800',
-                    'Failure': '#F44336',
-                    'Unknown': '#9E9E9E'
-                }
+                color_discrete_map=STAGE_COLORS
             )
             
             # Adjust layout based on theme
@@ -197,14 +281,11 @@ def build_overview_tab(flare):
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            # Display campaigns by stage with FRI scores using the new function
-            for stage, color in zip(
-                ['Healthy', 'Friction', 'Fatigue', 'Failure', 'Unknown'],
-                ['#4CAF50', '#FFCA28', '#FF9800', '#F44336', '#9E9E9E']
-            ):
-                if stage in summary["campaigns_by_stage"]:
-                    campaigns = summary["campaigns_by_stage"][stage]
-                    display_campaigns_by_stage(stage, color, campaigns, flare)
+            # Display campaigns by stage with FRI scores, grouping the latest rows in one pass
+            stage_groups = dict(tuple(latest.groupby('fatigue_stage', sort=False, observed=True)))
+            for stage, color in STAGE_COLORS.items():
+                if stage in stage_groups:
+                    display_campaigns_by_stage(stage, color, stage_groups[stage])
         
         st.markdown('</div>', unsafe_allow_html=True)
         
@@ -220,52 +301,18 @@ def build_overview_tab(flare):
             # Create columns for high risk campaign cards
             cols = st.columns(min(3, len(summary["high_risk_campaigns"])))
             
+            # Waste estimates cover every campaign, so fetch them once for all cards
+            waste_estimates = _cached_waste_estimates(flare, scores_key(flare))
+            
+            # Card HTML is assembled once per (campaigns, waste, theme) and reused across reruns
+            card_html = _high_risk_card_html(
+                summary["high_risk_campaigns"], waste_estimates, st.session_state.get('theme', 'light')
+            )
+            
             for i, campaign_info in enumerate(summary["high_risk_campaigns"]):
                 with cols[i % len(cols)]:
                     campaign_id = campaign_info["campaign_id"]
-                    stage = campaign_info["stage"]
-                    
-                    # Ensure high risk campaigns have appropriate stage and FRI
-                    if campaign_info['fri_score'] >= 75:
-                        stage = 'Failure'
-                        fri_score = max(75, campaign_info['fri_score'])
-                    elif campaign_info['fri_score'] >= 50:
-                        stage = 'Fatigue'
-                        fri_score = max(50, campaign_info['fri_score'])
-                    else:
-                        stage = 'Friction'
-                        fri_score = max(30, campaign_info['fri_score'])
-                    
-                    # Get waste estimates
-                    waste_estimates = flare.estimate_wasted_spend()
-                    waste_data = waste_estimates.get(campaign_id, {})
-                    waste_amount = waste_data.get("wasted_spend", 0) if isinstance(waste_data, dict) else 0
-                    waste_percent = waste_data.get("waste_percentage", 0) if isinstance(waste_data, dict) else 0
-                    
-                    # Determine colors based on theme
-                    theme = st.session_state.get('theme', 'light')
-                    bg_color = '#3a2525' if theme == 'dark' else '#FFF8F8'
-                    border_color = '#5a3333' if theme == 'dark' else '#FFCDD2'
-                    text_color = '#ffffff' if theme == 'dark' else '#111111'
-                    
-                    # Create styled high-risk campaign card
-                    st.markdown(f"""
-                    <div style='background-color: {bg_color}; border: 1px solid {border_color}; border-radius: 10px; padding: 20px; margin-bottom: 20px; box-shadow: 0 2px 10px rgba(244,67,54,0.1);'>
-                        <h3 style='color: {text_color}; margin-top: 0; margin-bottom: 10px;'>{campaign_id}</h3>
-                        <div style='margin-bottom: 15px;'><span class="stage-{stage.lower()}">{stage}</span></div>
-                        <div style='margin: 15px 0;'>
-                            <div style='margin-bottom: 5px; color: {text_color};'>FRI Score</div>
-                            <div class='progress-container'>
-                                <div class='progress-bar progress-bar-failure' style='width: {fri_score}%;'></div>
-                            </div>
-                            <div style='text-align: right; color: {text_color}; margin-top: 5px;'>{fri_score:.1f}</div>
-                        </div>
-                        <div style='margin: 20px 0;'>
-                            <div style='font-weight: bold; color: #D32F2F;'>Wasted Spend</div>
-                            <div style='font-size: 1.2rem; color: {text_color}; margin-top: 5px;'>{format_currency(waste_amount)} ({waste_percent:.1f}%)</div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(card_html[campaign_id], unsafe_allow_html=True)
                     
                     # Add a simple "View Details" button that only stores the campaign ID
                     if st.button(f"View Details", key=f"view_{campaign_id}"):
@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import numpy as np
+from ui.compat import fragment
+from tabs._cache import scores_key, campaign_index
 
 def calculate_waste_percentage(fri_score):
     """
@@ -9,14 +11,17 @@ def calculate_waste_percentage(fri_score):
     FRI 0 → 10% waste
     FRI 50 → 40% waste
     FRI 100 → 70% waste
+    
+    Accepts a scalar or an array/Series of scores; missing scores map to 10%.
     """
-    if pd.isna(fri_score) or not isinstance(fri_score, (int, float)):
+    try:
+        fri = np.asarray(fri_score, dtype=np.float64)
+    except (TypeError, ValueError):
         return 0.1  # Default to 10% waste
 
-    fri_score = max(0, min(100, fri_score))
-    min_waste = 0.1
-    max_waste = 0.7
-    return min_waste + (fri_score / 100) * (max_waste - min_waste)
+    # (max_waste - min_waste) / 100 = (0.7 - 0.1) / 100 = 0.006
+    waste = 0.1 + np.where(np.isnan(fri), 0.0, np.clip(fri, 0, 100)) * 0.006
+    return float(waste) if waste.ndim == 0 else waste
 
 def format_currency(value):
     """Format value as currency"""
@@ -24,8 +29,19 @@ def format_currency(value):
         return "$0.00"
     return f"${value:,.2f}"
 
+def _action_priority(index):
+    """Priority label for the index-th recommended action"""
+    return "High" if index < 2 else ("Medium" if index < 4 else "Low")
+
 def create_gauge_chart(fri_score, status):
     """Create a simplified plotly gauge chart for FRI score"""
+    theme = st.session_state.get('theme', 'light')
+    # The gauge shows one decimal place, so round before caching to let nearby scores share an entry
+    return _build_gauge_chart(round(float(fri_score), 1), status, theme)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _build_gauge_chart(fri_score, status, theme):
+    """Build the gauge figure once per (score, status, theme); each caller gets its own copy"""
     # Set colors based on status
     color_map = {
         'Healthy': '#4CAF50',
@@ -41,7 +57,7 @@ def create_gauge_chart(fri_score, status):
     fig = go.Figure(go.Indicator(
         mode="gauge+number",
         value=fri_score,
-        number={'font': {'size': 40}},
+        number={'font': {'size': 40}, 'valueformat': '.1f'},
         title={'text': f"Fatigue Risk Index<br><span style='font-size:1.2em; color:{color}'>{status}</span>"},
         domain={'x': [0, 1], 'y': [0, 1]},
         gauge={
@@ -64,76 +80,15 @@ def create_gauge_chart(fri_score, status):
         height=300,
         margin=dict(l=20, r=20, t=50, b=30),
         paper_bgcolor="rgba(0,0,0,0)",
-        font={'color': "#111111" if st.session_state.get('theme', 'light') == 'light' else "#FFFFFF"}
+        font={'color': "#111111" if theme == 'light' else "#FFFFFF"}
     )
     
     return fig
 
+@fragment
 def build_recommendations_tab(flare):
     """Build the recommendations tab with actionable insights"""
     try:
-        # Add custom CSS for colored circles and timeline styling
-        st.markdown("""
-        <style>
-        .circle-high {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            background-color: #F44336;
-            margin-right: 8px;
-        }
-        .circle-medium {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            background-color: #FF9800;
-            margin-right: 8px;
-        }
-        .circle-low {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            background-color: #4CAF50;
-            margin-right: 8px;
-        }
-        .timeline-card {
-            padding: 15px;
-            border-radius: 5px;
-            text-align: center;
-            height: 85px;
-            box-sizing: border-box;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            align-items: center;
-        }
-        .timeline-immediate {
-            background-color: #FFEBEE;
-        }
-        .timeline-week {
-            background-color: #FFF8E1;
-        }
-        .timeline-next {
-            background-color: #E8F5E9;
-        }
-        .timeline-card h4 {
-            margin: 0 0 10px 0;
-            font-size: 1.1rem;
-            width: 100%;
-            text-align: center;
-        }
-        .timeline-card p {
-            margin: 0;
-            font-size: 0.9rem;
-            width: 100%;
-            text-align: center;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
         st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
         
         # Check if recommendations can be generated
@@ -142,6 +97,9 @@ def build_recommendations_tab(flare):
             st.markdown('</div>', unsafe_allow_html=True)
             return
         
+        # Per-campaign slices of the fatigue scores
+        campaign_groups = campaign_index(flare.fatigue_scores, scores_key(flare))
+        
         # Get recommendations for all campaigns
         recommendations = flare.get_campaign_recommendations()
         campaign_ids = list(recommendations.keys())
@@ -225,7 +183,7 @@ def build_recommendations_tab(flare):
             # Campaign context metrics
             st.markdown("### Campaign Context")
             
-            campaign_data = flare.fatigue_scores[flare.fatigue_scores['campaign_id'] == selected_campaign]
+            campaign_data = campaign_groups.get(selected_campaign, flare.fatigue_scores.iloc[0:0])
             
             if not campaign_data.empty:
                 # Get latest data point
@@ -307,42 +265,24 @@ def build_recommendations_tab(flare):
             
             # Display recommendations using Streamlit components with colored circles
             if "actions_with_reasons" in campaign_rec:
-                for i, action_data in enumerate(campaign_rec["actions_with_reasons"]):
-                    action = action_data["action"]
-                    reason = action_data["reason"]
-                    
-                    action_priority = "High" if i < 2 else ("Medium" if i < 4 else "Low")
-                    priority_color_class = f"circle-{action_priority.lower()}"
-                    
-                    # Create header with color indicator
-                    st.markdown(
-                        f"""
-                        <div style="display: flex; align-items: center; margin-bottom: 5px;">
-                            <div class="{priority_color_class}"></div>
-                            <strong>{action_priority}:</strong> {action}
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-                    
-                    # Use standard expander for the reason
-                    with st.expander("Details", expanded=True):
-                        st.markdown(f"*{reason}*")
+                # Header with color indicator plus an always-open details block, batched into one render
+                action_html = "".join(
+                    f'<div style="display: flex; align-items: center; margin-bottom: 5px;">'
+                    f'<div class="circle-{_action_priority(i).lower()}"></div>'
+                    f'<strong>{_action_priority(i)}:</strong>&nbsp;{action_data["action"]}</div>'
+                    f'<details open style="margin-bottom: 15px;"><summary>Details</summary>'
+                    f'<em>{action_data["reason"]}</em></details>'
+                    for i, action_data in enumerate(campaign_rec["actions_with_reasons"])
+                )
             else:
                 # Fallback to simpler recommendation format
-                for i, action in enumerate(campaign_rec["actions"]):
-                    action_priority = "High" if i < 2 else ("Medium" if i < 4 else "Low")
-                    priority_color_class = f"circle-{action_priority.lower()}"
-                    
-                    st.markdown(
-                        f"""
-                        <div style="display: flex; align-items: center; margin-bottom: 10px; padding: 10px; background-color: #f5f5f5; border-radius: 5px;">
-                            <div class="{priority_color_class}"></div>
-                            <div><strong>{action_priority}:</strong> {action}</div>
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
+                action_html = "".join(
+                    f'<div style="display: flex; align-items: center; margin-bottom: 10px; padding: 10px; background-color: #f5f5f5; border-radius: 5px;">'
+                    f'<div class="circle-{_action_priority(i).lower()}"></div>'
+                    f'<div><strong>{_action_priority(i)}:</strong> {action}</div></div>'
+                    for i, action in enumerate(campaign_rec["actions"])
+                )
+            st.markdown(action_html, unsafe_allow_html=True)
             
             # Add implementation timeline with better styling
             st.subheader("Implementation Timeline")
@@ -1,34 +1,18 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
+from tabs._cache import scores_key, cached_summary
 
-def calculate_waste_percentage(fri_score):
-    """
-    Calculate waste percentage from FRI score using linear mapping:
-    FRI 0 → 10% waste
-    FRI 50 → 40% waste
-    FRI 100 → 70% waste
-    
-    Handles NaN values and ensures proper calculation
-    """
-    # Check for NaN or invalid values
-    if pd.isna(fri_score) or not isinstance(fri_score, (int, float)):
-        return 0.1  # Default to minimal waste (10%)
-    
-    # Ensure fri_score is within valid range
-    fri_score = max(0, min(100, fri_score))
-    
-    # Linear formula: waste = min_waste + (fri_score / max_fri) * (max_waste - min_waste)
-    min_waste = 0.1  # 10%
-    max_waste = 0.7  # 70%
-    max_fri = 100.0
-    
-    waste_percentage = min_waste + (fri_score / max_fri) * (max_waste - min_waste)
-    # Cap at 70%
-    waste_percentage = min(waste_percentage, max_waste)
-    
-    return waste_percentage
+# Layout shared by the tab's charts, registered once per process and layered on the default template
+pio.templates['flare'] = go.layout.Template(layout=go.Layout(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    margin=dict(l=10, r=10, t=30, b=10),
+    height=400
+))
+FLARE_TEMPLATE = 'plotly+flare'
 
 def format_currency(value):
     """Format value as currency"""
@@ -36,24 +20,62 @@ def format_currency(value):
         return "$0.00"
     return f"${value:,.2f}"
 
-def create_spend_waste_chart(waste_estimates):
-    """Create a stacked bar chart showing spend vs waste"""
-    # Extract data
-    campaigns = []
-    total_spend = []
-    wasted_spend = []
-    
-    for campaign, data in waste_estimates.items():
-        if isinstance(data, dict) and 'total_spend' in data and 'wasted_spend' in data:
-            campaigns.append(campaign)
-            total_spend.append(data["total_spend"])
-            wasted_spend.append(data["wasted_spend"])
+# Largest number of bars drawn in the waste-by-campaign chart; the rest are folded into "Other"
+MAX_CHART_CAMPAIGNS = 50
+
+def _top_campaigns_with_other(waste_df, limit=MAX_CHART_CAMPAIGNS):
+    """Keep the campaigns with the most wasted spend and fold the remainder into one "Other" row"""
+    if len(waste_df) <= limit:
+        return waste_df
     
-    # Calculate effective spend (total - wasted)
-    effective_spend = [t - w for t, w in zip(total_spend, wasted_spend)]
+    top = waste_df.nlargest(limit - 1, "Wasted Spend")
+    rest = waste_df.drop(top.index)
+    rest_total = rest["Total Spend"].sum()
+    other = pd.DataFrame({
+        "Campaign": [f"Other ({len(rest)} campaigns)"],
+        "Total Spend": [rest_total],
+        "Waste %": [rest["Wasted Spend"].sum() / rest_total * 100 if rest_total > 0 else 0.0],
+        "Wasted Spend": [rest["Wasted Spend"].sum()],
+        "Recoverable": [rest["Recoverable"].sum()]
+    })
+    return pd.concat([top, other], ignore_index=True)
+
+# Client-side number formats for the waste table. st.column_config needs Streamlit 1.23+;
+# older versions fall back to a pandas Styler.
+if hasattr(st, 'column_config'):
+    _WASTE_COLUMN_CONFIG = {
+        "Total Spend": st.column_config.NumberColumn(format="$ %.0f"),
+        "Wasted Spend": st.column_config.NumberColumn(format="$ %.0f"),
+        "Waste %": st.column_config.NumberColumn(format="%.1f%%"),
+        "Recoverable": st.column_config.NumberColumn(format="$ %.0f")
+    }
+else:
+    _WASTE_COLUMN_CONFIG = None
+
+@st.cache_data(show_spinner=False)
+def _cached_fri_waste(_flare, scores_key):
+    """FRI-driven waste per campaign, recomputed only when the fatigue scores change"""
+    return _flare.estimate_fri_waste()
+
+def _memoized_figure(name, figures_key, build, *args):
+    """Return the figure stored in session_state for figures_key, building it only on a miss"""
+    figures = st.session_state.setdefault('_spend_figs', {})
+    if figures.get('key') != figures_key:
+        figures.clear()
+        figures['key'] = figures_key
+    if name not in figures:
+        figures[name] = build(*args)
+    return figures[name]
+
+def create_spend_waste_chart(campaigns, total_spend, wasted_spend, text_color):
+    """Create a stacked bar chart showing spend vs waste (one entry per campaign in each array)"""
+    # Calculate effective spend (total - wasted) as one vector subtraction
+    total_spend = np.asarray(total_spend, dtype=np.float64)
+    wasted_spend = np.asarray(wasted_spend, dtype=np.float64)
+    effective_spend = total_spend - wasted_spend
     
     # Create figure
-    fig = go.Figure()
+    fig = go.Figure(layout=dict(template=FLARE_TEMPLATE))
     
     # Add effective spend bars
     fig.add_trace(go.Bar(
@@ -74,8 +96,6 @@ def create_spend_waste_chart(waste_estimates):
     ))
     
     # Update layout with theme-appropriate colors
-    text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
-    
     fig.update_layout(
         barmode='stack',
         title='Campaign Spend Efficiency',
@@ -90,13 +110,80 @@ def create_spend_waste_chart(waste_estimates):
             xanchor="right",
             x=1
         ),
-        height=400,
-        margin=dict(l=10, r=10, t=50, b=10),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=50),
+        font=dict(color=text_color)
+    )
+    
+    return fig
+
+def create_waste_by_campaign_chart(waste_df, text_color):
+    """Create a horizontal bar chart of wasted spend per campaign"""
+    chart_df = _top_campaigns_with_other(waste_df)
+    
+    # Create bar chart for waste by campaign with FLARE colors, straight from the column arrays
+    fig = go.Figure(go.Bar(
+        x=chart_df["Wasted Spend"].to_numpy(),
+        y=chart_df["Campaign"].to_numpy(),
+        orientation='h',
+        marker=dict(
+            color=chart_df["Waste %"].to_numpy(),
+            colorscale=[[0, "#FFCDD2"], [0.5, "#FF5A5F"], [1, "#D32F2F"]],  # FLARE palette
+            showscale=True,
+            colorbar=dict(title="Waste Percentage (%)")
+        ),
+        customdata=chart_df[["Total Spend", "Waste %", "Recoverable"]].to_numpy(),
+        hovertemplate="<b>%{y}</b><br>" +
+                      "Wasted Spend: $%{x:.2f}<br>" +
+                      "Total Spend: $%{customdata[0]:.2f}<br>" +
+                      "Waste Percentage: %{customdata[1]:.1f}%<br>" +
+                      "Recoverable: $%{customdata[2]:.2f}<br>" +
+                      "<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        template=FLARE_TEMPLATE,
+        xaxis_title="Wasted Spend ($)",
+        yaxis=dict(title="Campaign", categoryorder='total ascending'),
+        font=dict(color=text_color)
+    )
+    
+    return fig
+
+def create_projection_chart(current_effective, current_waste, optimized_effective, optimized_waste, text_color):
+    """Create a stacked bar chart comparing current spend with the optimized projection"""
+    scenarios = ["Current", "With FLARE"]
+    
+    # Create stacked bar chart with FLARE colors, one trace per spend category
+    fig = go.Figure([
+        go.Bar(x=scenarios, y=[current_effective, optimized_effective], name="Effective Spend",
+               marker=dict(color="#4CAF50")),
+        go.Bar(x=scenarios, y=[current_waste, optimized_waste], name="Wasted Spend",
+               marker=dict(color="#FF5A5F"))  # Updated to FLARE brand color
+    ])
+    fig.update_layout(template=FLARE_TEMPLATE, barmode="stack", yaxis_title="Spend ($)")
+    
+    # Add optimization impact annotation
+    savings = current_waste - optimized_waste
+    fig.add_annotation(
+        x=1,
+        y=optimized_effective + (optimized_waste / 2),
+        text=f"${savings:,.2f} savings",
+        showarrow=True,
+        arrowhead=1,
+        arrowcolor="#FF5A5F",  # Updated to FLARE brand color
+        arrowsize=1,
+        arrowwidth=2,
+        ax=-40,
+        ay=-40,
         font=dict(color=text_color)
     )
     
+    # Update layout
+    fig.update_layout(font=dict(color=text_color))
+    
+    # Format y-axis as currency
+    fig.update_yaxes(tickprefix="$", tickformat=",")
+    
     return fig
 
 def build_spend_analysis_tab(flare):
@@ -110,42 +197,18 @@ def build_spend_analysis_tab(flare):
             st.markdown('</div>', unsafe_allow_html=True)
             return
         
-        # Update waste estimates with dynamic calculation
-        waste_estimates = flare.estimate_wasted_spend()
+        # Per-campaign waste from each campaign's latest FRI score
+        campaign_waste = _cached_fri_waste(flare, scores_key(flare))
         
-        if not waste_estimates:
+        # Get summary data
+        summary = cached_summary(flare, scores_key(flare))
+        
+        if campaign_waste is None or campaign_waste.empty:
             st.warning("No waste data to display. Please process campaign data first.")
             st.markdown('</div>', unsafe_allow_html=True)
             return
         
-        # Fix waste calculations to handle any NaN values
-        for campaign, data in waste_estimates.items():
-            if isinstance(data, dict):
-                # Get the latest FRI score
-                campaign_data = flare.fatigue_scores[flare.fatigue_scores['campaign_id'] == campaign]
-                if not campaign_data.empty:
-                    latest_fri = campaign_data.iloc[-1]['fri_score']
-                    if pd.isna(latest_fri):
-                        latest_fri = 0  # Default to 0 if NaN
-                    
-                    # Calculate dynamic waste percentage based on FRI
-                    waste_percentage = calculate_waste_percentage(latest_fri)
-                    total_spend = data["total_spend"]
-                    wasted_spend = total_spend * waste_percentage
-                    
-                    # Update values in waste_estimates with proper handling of NaN
-                    waste_estimates[campaign]["waste_percentage"] = float(waste_percentage * 100)
-                    waste_estimates[campaign]["wasted_spend"] = float(wasted_spend)
-                    waste_estimates[campaign]["recoverable_spend"] = float(wasted_spend)
-        
-        # Recalculate total waste for summary
-        total_waste = sum(
-            data["wasted_spend"] for campaign, data in waste_estimates.items() 
-            if isinstance(data, dict) and "wasted_spend" in data
-        )
-        
-        # Get summary data
-        summary = flare.get_summary_report()
+        total_waste = float(campaign_waste["wasted_spend"].sum())
         
         # Update summary waste data
         summary["estimated_waste"] = float(total_waste)
@@ -183,64 +246,35 @@ def build_spend_analysis_tab(flare):
         
         st.divider()  # Add divider between sections
         
+        # Chart text color for the current theme, shared by all three charts
+        text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
+        
+        # Figures are reused across reruns until the scores or the theme change
+        figures_key = (scores_key(flare), text_color)
+        
         # Create visualization tabs
         waste_tabs = st.tabs(["Waste by Campaign", "Spend Efficiency", "Optimization Impact"])
         
         with waste_tabs[0]:
-            # Create waste by campaign table
-            waste_data = []
+            # Create waste by campaign table from the model's columns
+            waste_df = pd.DataFrame({
+                "Campaign": campaign_waste.index,
+                "Total Spend": campaign_waste["total_spend"].to_numpy(),
+                "Waste %": campaign_waste["waste_percentage"].to_numpy(),
+                "Wasted Spend": campaign_waste["wasted_spend"].to_numpy(),
+                "Recoverable": campaign_waste["recoverable_spend"].to_numpy()
+            })
             
-            for campaign, data in waste_estimates.items():
-                if isinstance(data, dict) and "total_spend" in data and "wasted_spend" in data:
-                    waste_data.append({
-                        "Campaign": campaign,
-                        "Total Spend": data["total_spend"],
-                        "Waste %": data["waste_percentage"],
-                        "Wasted Spend": data["wasted_spend"],
-                        "Recoverable": data["recoverable_spend"] if "recoverable_spend" in data else data["wasted_spend"]
-                    })
+            try:
+                fig = _memoized_figure("waste", figures_key, create_waste_by_campaign_chart, waste_df, text_color)
+                st.plotly_chart(fig, use_container_width=True)
+            except Exception as chart_error:
+                st.error(f"Unable to display waste by campaign chart. {chart_error}")
             
-            if not waste_data:
-                st.warning("No waste data available to display.")
+            # Display data table, formatted in the browser when column_config is available
+            if _WASTE_COLUMN_CONFIG is not None:
+                st.dataframe(waste_df, column_config=_WASTE_COLUMN_CONFIG, use_container_width=True)
             else:
-                waste_df = pd.DataFrame(waste_data)
-                
-                # Get color based on theme
-                text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
-                
-                # Create bar chart for waste by campaign with FLARE colors
-                fig = px.bar(
-                    waste_df,
-                    x="Wasted Spend",
-                    y="Campaign",
-                    orientation='h',
-                    color="Waste %",
-                    color_continuous_scale=["#FFCDD2", "#FF5A5F", "#D32F2F"],  # FLARE palette
-                    labels={"Wasted Spend": "Wasted Spend ($)", "Campaign": "Campaign", "Waste %": "Waste Percentage (%)"},
-                    hover_data=["Total Spend", "Waste %", "Recoverable"]
-                )
-                
-                fig.update_layout(
-                    height=400,
-                    margin=dict(l=10, r=10, t=30, b=10),
-                    yaxis={'categoryorder':'total ascending'},
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color=text_color)
-                )
-                
-                # Format hover template
-                fig.update_traces(
-                    hovertemplate="<b>%{y}</b><br>" +
-                                "Wasted Spend: $%{x:.2f}<br>" +
-                                "Total Spend: $%{customdata[0]:.2f}<br>" +
-                                "Waste Percentage: %{customdata[1]:.1f}%<br>" +
-                                "Recoverable: $%{customdata[2]:.2f}<br>"
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Display data table
                 st.dataframe(waste_df.style.format({
                     "Total Spend": "$ {:,.0f}",
                     "Wasted Spend": "$ {:,.0f}",
@@ -250,23 +284,26 @@ def build_spend_analysis_tab(flare):
         
         with waste_tabs[1]:
             # Create stacked bar chart showing effective vs wasted spend
-            if len(waste_estimates) > 0:
-                fig = create_spend_waste_chart(waste_estimates)
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Add explanation with updated styling
-                st.markdown(
-                    f"""
-                    <div style="padding: 20px; background-color: rgba(255,90,95,0.05); border-radius: 10px; margin: 20px 0; border: 1px solid rgba(255,90,95,0.1);">
-                        <h3 style="margin-top: 0; color: #FF5A5F; font-weight: 600;">Understanding Spend Efficiency</h3>
-                        <p>This chart shows how much of your ad spend is being effectively utilized (green) versus wasted due to ad fatigue (red).</p>
-                        <p style="margin-bottom: 0;">Campaigns with larger red portions are experiencing more severe fatigue and should be prioritized for optimization.</p>
-                    </div>
-                    """,
-                    unsafe_allow_html=True
+            try:
+                fig = _memoized_figure(
+                    "efficiency", figures_key, create_spend_waste_chart,
+                    campaign_waste.index, campaign_waste["total_spend"], campaign_waste["wasted_spend"], text_color
                 )
-            else:
-                st.warning("No spend efficiency data available to display.")
+                st.plotly_chart(fig, use_container_width=True)
+            except Exception as chart_error:
+                st.error(f"Unable to display spend efficiency chart. {chart_error}")
+            
+            # Add explanation with updated styling
+            st.markdown(
+                f"""
+                <div style="padding: 20px; background-color: rgba(255,90,95,0.05); border-radius: 10px; margin: 20px 0; border: 1px solid rgba(255,90,95,0.1);">
+                    <h3 style="margin-top: 0; color: #FF5A5F; font-weight: 600;">Understanding Spend Efficiency</h3>
+                    <p>This chart shows how much of your ad spend is being effectively utilized (green) versus wasted due to ad fatigue (red).</p>
+                    <p style="margin-bottom: 0;">Campaigns with larger red portions are experiencing more severe fatigue and should be prioritized for optimization.</p>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
         
         with waste_tabs[2]:
             # Create projection chart showing potential impact of optimization
@@ -278,79 +315,18 @@ def build_spend_analysis_tab(flare):
             # Assume 70% waste reduction with FLARE
             optimized_waste = current_waste * 0.3
             optimized_effective = summary["total_spend"] - optimized_waste
-            
-            # Add data points
-            projection_data = []
-            projection_data.append({
-                "Scenario": "Current",
-                "Category": "Effective Spend",
-                "Value": current_effective
-            })
-            projection_data.append({
-                "Scenario": "Current",
-                "Category": "Wasted Spend",
-                "Value": current_waste
-            })
-            projection_data.append({
-                "Scenario": "With FLARE",
-                "Category": "Effective Spend",
-                "Value": optimized_effective
-            })
-            projection_data.append({
-                "Scenario": "With FLARE",
-                "Category": "Wasted Spend",
-                "Value": optimized_waste
-            })
-            
-            # Create dataframe
-            projection_df = pd.DataFrame(projection_data)
-            
-            # Get color based on theme
-            text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
-            
-            # Create grouped bar chart with FLARE colors
-            fig = px.bar(
-                projection_df,
-                x="Scenario",
-                y="Value",
-                color="Category",
-                barmode="stack",
-                color_discrete_map={
-                    "Effective Spend": "#4CAF50",
-                    "Wasted Spend": "#FF5A5F"  # Updated to FLARE brand color
-                },
-                labels={"Value": "Spend ($)", "Scenario": "", "Category": ""}
-            )
-            
-            # Add optimization impact annotation
             savings = current_waste - optimized_waste
-            fig.add_annotation(
-                x=1,
-                y=optimized_effective + (optimized_waste / 2),
-                text=f"${savings:,.2f} savings",
-                showarrow=True,
-                arrowhead=1,
-                arrowcolor="#FF5A5F",  # Updated to FLARE brand color
-                arrowsize=1,
-                arrowwidth=2,
-                ax=-40,
-                ay=-40,
-                font=dict(color=text_color)
-            )
+            waste_reduction_pct = savings / current_waste * 100 if current_waste > 0 else 0.0
+            efficiency_gain_pct = savings / summary["total_spend"] * 100 if summary["total_spend"] > 0 else 0.0
             
-            # Update layout
-            fig.update_layout(
-                height=400,
-                margin=dict(l=10, r=10, t=30, b=10),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color=text_color)
-            )
-            
-            # Format y-axis as currency
-            fig.update_yaxes(tickprefix="$", tickformat=",")
-            
-            st.plotly_chart(fig, use_container_width=True)
+            try:
+                fig = _memoized_figure(
+                    "projection", figures_key, create_projection_chart,
+                    current_effective, current_waste, optimized_effective, optimized_waste, text_color
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            except Exception as chart_error:
+                st.error(f"Unable to display optimization impact chart. {chart_error}")
             
             # Add explanation and call to action with updated styling
             st.markdown(
@@ -358,7 +334,7 @@ def build_spend_analysis_tab(flare):
                 <div style="padding: 24px; background-color: rgba(255,90,95,0.05); border-radius: 12px; margin-top: 20px; border: 1px solid rgba(255,90,95,0.1);">
                     <h3 style="margin-top: 0; color: #FF5A5F; font-weight: 600;">Optimization Impact</h3>
                     <p>By implementing FLARE recommendations, you could potentially save <strong>{format_currency(savings)}</strong> in wasted ad spend.</p>
-                    <p>This represents a <strong>{(savings/current_waste*100):.1f}%</strong> reduction in waste and a <strong>{(savings/summary["total_spend"]*100):.1f}%</strong> overall improvement in campaign efficiency.</p>
+                    <p>This represents a <strong>{waste_reduction_pct:.1f}%</strong> reduction in waste and a <strong>{efficiency_gain_pct:.1f}%</strong> overall improvement in campaign efficiency.</p>
                     <div style="text-align: center; margin-top: 20px;">
                         <button style="background-color: #FF5A5F; color: white; border: none; padding: 12px 24px; border-radius: 6px; font-weight: 600; cursor: pointer; box-shadow: 0 2px 5px rgba(255,90,95,0.3);">
                             Download Full Analysis Report
@@ -372,4 +348,4 @@ def build_spend_analysis_tab(flare):
         st.markdown('</div>', unsafe_allow_html=True)
     
     except Exception as e:
-        st.error(f"Error rendering Spend Analysis tab: {str(e)}")
\ No newline at end of file
+        st.error(f"Error rendering Spend Analysis tab: {str(e)}")
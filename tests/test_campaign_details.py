@@ -0,0 +1,31 @@
+"""
+Tests for the campaign details tab formatters
+"""
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("streamlit")
+pytest.importorskip("plotly")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabs.campaign_details import format_currency, format_number
+
+VALUES = [np.inf, np.nan, 1234]
+
+def test_format_number_masks_non_finite_values():
+    assert list(format_number(pd.Series(VALUES))) == ["0", "0", "1,234"]
+    assert list(format_number(np.array(VALUES))) == ["0", "0", "1,234"]
+
+def test_format_currency_masks_non_finite_values():
+    assert list(format_currency(pd.Series(VALUES))) == ["$0.00", "$0.00", "$1,234.00"]
+    assert list(format_currency(np.array(VALUES))) == ["$0.00", "$0.00", "$1,234.00"]
+
+def test_vector_and_scalar_paths_agree():
+    for value in VALUES + [-np.inf]:
+        assert format_number(np.array([value]))[0] == format_number(value)
+        assert format_currency(np.array([value]))[0] == format_currency(value)
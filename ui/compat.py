@@ -0,0 +1,10 @@
+"""
+FLARE Streamlit Compatibility Helpers
+
+Shims for Streamlit features that are newer than the minimum supported version.
+"""
+import streamlit as st
+
+# Rerun only the decorated function on its own widget interactions. st.fragment needs
+# Streamlit 1.37+ (1.33+ as experimental_fragment); older versions just run it unwrapped.
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
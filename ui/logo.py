@@ -2,23 +2,32 @@
 FLARE Logo Component - Streamlit-compatible image loading
 
 This module provides functions to render the FLARE logo from a local image file.
+The rendered logo is served by Streamlit's static file server (static/ next to app.py,
+enabled via server.enableStaticServing) instead of being base64-embedded in the page.
 """
 import streamlit as st
-import base64
+from functools import lru_cache
 import os
 
-def get_base64_encoded_image(image_path):
-    """Get base64 encoded image data for embedding in HTML"""
-    try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode('utf-8')
-    except Exception as e:
-        print(f"Error loading image: {e}")
-        return None
+# Size mapping
+LOGO_SIZES = {
+    "small": {"logo": 30, "text": 18},
+    "medium": {"logo": 40, "text": 24},
+    "large": {"logo": 80, "text": 42}
+}
+
+# The logo file, served by Streamlit's static file server, and the URL it is served at
+STATIC_LOGO_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "flare_logo.png")
+STATIC_LOGO_URL = "app/static/flare_logo.png"
+
+@st.cache_resource(show_spinner=False)
+def find_logo_path():
+    """Path of the logo file, or None if it is missing (checked once per process)"""
+    return STATIC_LOGO_FILE if os.path.exists(STATIC_LOGO_FILE) else None
 
 def render_logo(size="medium", type="horizontal"):
     """
-    Renders the FLARE logo using base64 encoded image
+    Renders the FLARE logo from the statically served image
     
     Parameters:
     - size: "small", "medium", or "large"
@@ -27,43 +36,27 @@ def render_logo(size="medium", type="horizontal"):
     Returns:
     - HTML for the logo display
     """
-    # Size mapping
-    size_map = {
-        "small": {"logo": 30, "text": 18},
-        "medium": {"logo": 40, "text": 24},
-        "large": {"logo": 80, "text": 42}
-    }
-    
-    logo_size = size_map[size]["logo"]
-    text_size = size_map[size]["text"]
+    return _logo_html(size, type, st.session_state.get('theme', 'light') == 'dark')
+
+@lru_cache(maxsize=None)
+def _logo_html(size, type, dark):
+    """Build the logo HTML for one (size, type, theme) combination; memoized since there are only 12"""
+    logo_size = LOGO_SIZES[size]["logo"]
+    text_size = LOGO_SIZES[size]["text"]
     
     # Get text color based on theme
-    text_color = "#ffffff" if st.session_state.get('theme', 'light') == 'dark' else "#212121"
-    
-    # Try multiple logo paths (for flexibility)
-    logo_paths = [
-        "/Users/hrishibhanushali/Documents/Flare/assets/Flare logo.png",
-        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "Flare logo.png"),
-        "assets/Flare logo.png"
-    ]
-    
-    # Try to get the base64 encoded image
-    logo_base64 = None
-    for path in logo_paths:
-        logo_base64 = get_base64_encoded_image(path)
-        if logo_base64:
-            break
+    text_color = "#ffffff" if dark else "#212121"
     
     # System font stack for consistent appearance
     font_stack = "system-ui, -apple-system, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif"
     
-    # If logo was loaded successfully, use it
-    if logo_base64:
+    # If the static logo is available, reference it by URL
+    if os.path.exists(STATIC_LOGO_FILE):
         # Horizontal layout (logo next to text)
         if type == "horizontal":
             return f"""
             <div style="display: flex; align-items: center; gap: 8px;">
-                <img src="data:image/png;base64,{logo_base64}" width="{logo_size}" height="{logo_size}" alt="FLARE Logo" style="object-fit: contain;" />
+                <img src="{STATIC_LOGO_URL}" width="{logo_size}" height="{logo_size}" alt="FLARE Logo" style="object-fit: contain;" />
                 <span style="font-family: {font_stack}; font-weight: 700; font-size: {text_size}px; color: {text_color}; letter-spacing: 0.5px;">FLARE</span>
             </div>
             """
@@ -72,7 +65,7 @@ def render_logo(size="medium", type="horizontal"):
         else:
             return f"""
             <div style="display: flex; flex-direction: column; align-items: center; gap: 10px; margin-bottom: 20px;">
-                <img src="data:image/png;base64,{logo_base64}" width="{logo_size}" height="{logo_size}" alt="FLARE Logo" style="object-fit: contain;" />
+                <img src="{STATIC_LOGO_URL}" width="{logo_size}" height="{logo_size}" alt="FLARE Logo" style="object-fit: contain;" />
                 <span style="font-family: {font_stack}; font-weight: 700; font-size: {text_size}px; color: {text_color}; letter-spacing: 1px;">FLARE</span>
             </div>
             """
@@ -1,166 +1,228 @@
 import streamlit as st
+import sys
+import importlib.util
+from functools import lru_cache
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+import plotly.io as pio
+try:
+    import bottleneck as bn
+except ImportError:  # bottleneck is optional - fall back to a NumPy scan
+    bn = None
+try:
+    import orjson
+except ImportError:  # orjson is optional - plotly keeps its stdlib json encoder
+    orjson = None
 
-def create_campaign_chart(campaign_data):
-    """Create an interactive Plotly chart for campaign metrics"""
-    # Get color based on theme
-    text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
-    
-    # Check if required columns exist
-    required_columns = ['date', 'ctr']
-    missing_columns = [col for col in required_columns if col not in campaign_data.columns]
+# Serialize figures for the browser with orjson when it is installed
+if orjson is not None:
+    pio.json.config.default_engine = 'orjson'
+
+# Fatigue stage colors shared by every chart and gauge
+STAGE_COLORS = {
+    'Healthy': '#4CAF50',
+    'Friction': '#FFCA28',
+    'Fatigue': '#FF9800',
+    'Failure': '#F44336',
+    'Unknown': '#9E9E9E'
+}
+
+# Text colors per theme
+THEME_COLORS = {
+    'light': {'text': '#111111'},
+    'dark': {'text': '#ffffff'},
+}
+
+def _resolved_theme():
+    """Read the session's theme - called once per viz function"""
+    return st.session_state.get('theme', 'light')
+
+def _theme_colors(theme):
+    """Return the color table for a theme, falling back to light"""
+    return THEME_COLORS.get(theme, THEME_COLORS['light'])
+
+# Series longer than this are downsampled to MAX_CHART_POINTS before plotting
+DOWNSAMPLE_THRESHOLD = 2000
+MAX_CHART_POINTS = 1500
+
+def _lttb_indices(values, n_out=MAX_CHART_POINTS):
+    """Pick the row positions to plot using Largest-Triangle-Three-Buckets"""
+    n = len(values)
+    if n <= DOWNSAMPLE_THRESHOLD or n_out >= n:
+        return np.arange(n)
+    
+    # Rows are evenly spaced in time, so the row position serves as x
+    y = np.nan_to_num(np.asarray(values, dtype=float))
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = (end + next_end - 1) / 2.0
+        avg_y = y[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick and the next bucket's average
+        xs = np.arange(start, end)
+        area = np.abs((a - avg_x) * (y[start:end] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
     
-    if missing_columns:
-        # Create an error message figure
-        fig = go.Figure()
-        fig.update_layout(
-            title=f"Missing required columns: {', '.join(missing_columns)}",
-            height=400,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color=text_color)
-        )
-        fig.add_annotation(
-            text="Campaign data visualization requires date and CTR data",
+    return indices
+
+# Columns the campaign chart cannot be drawn without
+REQUIRED_CHART_COLUMNS = ('date', 'ctr')
+
+# Subplot rows of the campaign chart, top to bottom, as (title, y-domain)
+CAMPAIGN_CHART_ROWS = [
+    ("Click-Through Rate (CTR)", [0.7333333333333333, 1.0]),
+    ("Cost Per Acquisition (CPA)", [0.36666666666666664, 0.6333333333333333]),
+    ("Fatigue Risk Index (FRI)", [0.0, 0.26666666666666666]),
+]
+
+# FRI stage thresholds drawn on the bottom row as (value, label, color)
+FRI_THRESHOLDS = [
+    (20, "Friction", "#FFCA28"),
+    (50, "Fatigue", "#FF9800"),
+    (75, "Failure", "#F44336"),
+]
+
+# The threshold lines never change, so their layout shapes are built once
+FRI_THRESHOLD_SHAPES = [
+    dict(type='line', xref='x3 domain', yref='y3', x0=0, x1=1, y0=threshold, y1=threshold,
+         line=dict(color=color, width=1, dash='dash'))
+    for threshold, _, color in FRI_THRESHOLDS
+]
+
+def _all_nan(values):
+    """Return True when a numeric column holds no values at all"""
+    arr = np.asarray(values, dtype=np.float64)
+    # bottleneck stops at the first real value instead of scanning the whole column
+    return bool(bn.allnan(arr)) if bn is not None else bool(np.isnan(arr).all())
+
+def _to_datetime(values):
+    """Return values as datetimes, skipping the parse when they already are"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, cache=True)
+
+def _message_figure(title, message, text_color):
+    """Build an empty figure that shows a title and a centred message"""
+    return go.Figure(layout=dict(
+        title=title,
+        height=400,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color=text_color),
+        annotations=[dict(
+            text=message,
             showarrow=False,
             xref="paper", yref="paper",
             x=0.5, y=0.5,
             font=dict(size=14, color=text_color)
+        )]
+    ))
+
+def _build_campaign_chart(campaign_data, text_color):
+    """Build the interactive Plotly figure for campaign metrics"""
+    # Check if required columns exist
+    columns = frozenset(campaign_data.columns)
+    missing_columns = [col for col in REQUIRED_CHART_COLUMNS if col not in columns]
+    
+    if missing_columns:
+        # Create an error message figure
+        return _message_figure(
+            f"Missing required columns: {', '.join(missing_columns)}",
+            "Campaign data visualization requires date and CTR data",
+            text_color
         )
-        return fig
     
-    # Create figure with multiple subplots
-    fig = make_subplots(rows=3, cols=1, 
-                        shared_xaxes=True, 
-                        vertical_spacing=0.1,
-                        subplot_titles=("Click-Through Rate (CTR)", 
-                                       "Cost Per Acquisition (CPA)", 
-                                       "Fatigue Risk Index (FRI)"))
+    # Collect traces, shapes and annotations, then build the figure once.
+    # Row r of the three stacked subplots uses axes x{r}/y{r}.
+    traces = []
+    shapes = []
+    annotations = [
+        dict(text=title, x=0.5, y=domain[1], xref="paper", yref="paper",
+             xanchor="center", yanchor="bottom", showarrow=False, font=dict(size=16))
+        for title, domain in CAMPAIGN_CHART_ROWS
+    ]
     
     # Add CTR line with improved styling
     try:
-        fig.add_trace(
+        ctr_rows = campaign_data.iloc[_lttb_indices(campaign_data['ctr'])]
+        traces.append(
             go.Scatter(
-                x=campaign_data['date'], 
-                y=campaign_data['ctr']*100, 
+                x=ctr_rows['date'], 
+                y=ctr_rows['ctr']*100, 
                 name="CTR (%)", 
                 line=dict(color="#0F2E4C", width=2.5),
                 mode='lines+markers',
-                marker=dict(size=6, color="#0F2E4C")
-            ),
-            row=1, col=1
+                marker=dict(size=6, color="#0F2E4C"),
+                xaxis='x', yaxis='y'
+            )
         )
     except Exception as e:
         st.warning(f"Error adding CTR data: {e}")
     
     # Add CPA line if available with improved styling
+    has_cpa = 'cpa' in columns and not _all_nan(campaign_data['cpa'])
     try:
-        if 'cpa' in campaign_data.columns and not campaign_data['cpa'].isnull().all():
-            fig.add_trace(
+        if has_cpa:
+            cpa_rows = campaign_data.iloc[_lttb_indices(campaign_data['cpa'])]
+            traces.append(
                 go.Scatter(
-                    x=campaign_data['date'], 
-                    y=campaign_data['cpa'], 
+                    x=cpa_rows['date'], 
+                    y=cpa_rows['cpa'], 
                     name="CPA ($)", 
                     line=dict(color="#2C5F8E", width=2.5),
                     mode='lines+markers',
-                    marker=dict(size=6, color="#2C5F8E")
-                ),
-                row=2, col=1
+                    marker=dict(size=6, color="#2C5F8E"),
+                    xaxis='x2', yaxis='y2'
+                )
             )
     except Exception as e:
         st.warning(f"Error adding CPA data: {e}")
     
-    # Create color map for FRI points - using our new branded colors
-    stage_colors = {
-        'Healthy': '#4CAF50',
-        'Friction': '#FFCA28',
-        'Fatigue': '#FF9800',
-        'Failure': '#F44336',
-        'Unknown': '#9E9E9E'
-    }
-    
     # Add FRI scatter plot with color based on stage
     try:
-        if 'fri_score' in campaign_data.columns and 'fatigue_stage' in campaign_data.columns:
-            # Fill NaN values in fri_score
-            campaign_data['fri_score'] = campaign_data['fri_score'].fillna(0)
+        if {'fri_score', 'fatigue_stage'} <= columns:
+            # Fill NaN values in fri_score without touching the caller's frame
+            fri_scores = np.nan_to_num(campaign_data['fri_score'].to_numpy(dtype=np.float64), nan=0.0)
+            fri_index = _lttb_indices(fri_scores)
+            fri_rows = campaign_data.iloc[fri_index]
             
-            fig.add_trace(
+            traces.append(
                 go.Scatter(
-                    x=campaign_data['date'], 
-                    y=campaign_data['fri_score'],
+                    x=fri_rows['date'], 
+                    y=fri_scores[fri_index],
                     mode='lines+markers',
                     name="FRI Score", 
                     marker=dict(
                         size=8,
-                        color=[stage_colors.get(stage, '#9E9E9E') for stage in campaign_data['fatigue_stage']],
+                        color=fri_rows['fatigue_stage'].astype(object).map(STAGE_COLORS).fillna('#9E9E9E').to_numpy(),
                         line=dict(width=1, color='DarkSlateGrey')
                     ),
-                    line=dict(color='#7f7f7f', width=1.5, dash='dot')
-                ),
-                row=3, col=1
+                    line=dict(color='#7f7f7f', width=1.5, dash='dot'),
+                    xaxis='x3', yaxis='y3'
+                )
             )
             
-            # Add threshold lines for FRI with improved styling
-            fig.add_hline(y=20, line=dict(color='#FFCA28', width=1, dash='dash'), row=3, col=1)
-            fig.add_hline(y=50, line=dict(color='#FF9800', width=1, dash='dash'), row=3, col=1)
-            fig.add_hline(y=75, line=dict(color='#F44336', width=1, dash='dash'), row=3, col=1)
-            
-            # Add annotations for threshold lines
-            fig.add_annotation(
-                x=campaign_data['date'].iloc[0],
-                y=20,
-                text="Friction",
-                showarrow=False,
-                xshift=-40,
-                font=dict(size=10, color="#FFCA28"),
-                row=3, col=1
-            )
-            
-            fig.add_annotation(
-                x=campaign_data['date'].iloc[0],
-                y=50,
-                text="Fatigue",
-                showarrow=False,
-                xshift=-40,
-                font=dict(size=10, color="#FF9800"),
-                row=3, col=1
-            )
-            
-            fig.add_annotation(
-                x=campaign_data['date'].iloc[0],
-                y=75,
-                text="Failure",
-                showarrow=False,
-                xshift=-40,
-                font=dict(size=10, color="#F44336"),
-                row=3, col=1
-            )
+            # Add threshold lines and their labels for FRI with improved styling
+            first_date = campaign_data['date'].iloc[0]
+            shapes = FRI_THRESHOLD_SHAPES
+            annotations += [
+                dict(x=first_date, y=threshold, xref='x3', yref='y3', text=label,
+                     showarrow=False, xshift=-40, font=dict(size=10, color=color))
+                for threshold, label, color in FRI_THRESHOLDS
+            ]
     except Exception as e:
         st.warning(f"Error adding FRI data: {e}")
     
-    # Update layout with theme-specific settings and improved styling
-    fig.update_layout(
-        height=800,
-        margin=dict(l=20, r=20, t=50, b=30),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        ),
-        hovermode="x unified",
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color=text_color, size=12)
-    )
-    
-    # Update axes for better readability
-    fig.update_xaxes(
+    # Shared axis styling for better readability
+    axis_style = dict(
         showgrid=True,
         gridwidth=0.5,
         gridcolor='rgba(150,150,150,0.1)',
@@ -169,129 +231,160 @@ def create_campaign_chart(campaign_data):
         linewidth=0.5,
         linecolor='rgba(150,150,150,0.5)'
     )
-    
-    fig.update_yaxes(
-        showgrid=True,
-        gridwidth=0.5,
-        gridcolor='rgba(150,150,150,0.1)',
-        zeroline=False,
-        showline=True,
-        linewidth=0.5,
-        linecolor='rgba(150,150,150,0.5)'
+    y_titles = ["CTR (%)", "CPA ($)" if has_cpa else "CPA (Data Unavailable)", "FRI Score"]
+    
+    # The x-axes are shared, so only the bottom row shows tick labels
+    axes = {}
+    for row, ((_, domain), y_title) in enumerate(zip(CAMPAIGN_CHART_ROWS, y_titles), start=1):
+        suffix = '' if row == 1 else str(row)
+        x_axis = dict(axis_style, anchor='y' + suffix, domain=[0.0, 1.0])
+        if row < len(CAMPAIGN_CHART_ROWS):
+            x_axis.update(matches='x3', showticklabels=False)
+        else:
+            x_axis.update(title=dict(text="Date"), automargin=True)
+        axes['xaxis' + suffix] = x_axis
+        axes['yaxis' + suffix] = dict(axis_style, anchor='x' + suffix, domain=domain,
+                                      title=dict(text=y_title), automargin=True)
+    
+    # Build the figure with theme-specific settings and improved styling
+    return go.Figure(
+        data=traces,
+        layout=dict(
+            height=800,
+            margin=dict(l=20, r=20, t=50, b=30),
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            ),
+            hovermode="x unified",
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color=text_color, size=12),
+            shapes=shapes,
+            annotations=annotations,
+            **axes
+        )
     )
-    
-    # Update y-axes labels
-    fig.update_yaxes(title_text="CTR (%)", row=1, col=1, automargin=True)
-    if 'cpa' in campaign_data.columns and not campaign_data['cpa'].isnull().all():
-        fig.update_yaxes(title_text="CPA ($)", row=2, col=1, automargin=True)
-    else:
-        fig.update_yaxes(title_text="CPA (Data Unavailable)", row=2, col=1, automargin=True)
-    fig.update_yaxes(title_text="FRI Score", row=3, col=1, automargin=True)
-    fig.update_xaxes(title_text="Date", row=3, col=1, automargin=True)
-    
-    return fig
 
-def create_spend_waste_chart(waste_estimates):
-    """Create a stacked bar chart showing spend vs waste"""
-    # Extract data
-    campaigns = []
-    total_spend = []
-    wasted_spend = []
-    
-    for campaign, data in waste_estimates.items():
-        if isinstance(data, dict):
-            if 'total_spend' in data and 'wasted_spend' in data:
-                campaigns.append(campaign)
-                total_spend.append(data['total_spend'])
-                wasted_spend.append(data['wasted_spend'])
+@st.cache_data(ttl=3600, max_entries=64)
+def _cached_campaign_chart(campaign_data, theme):
+    """Build the campaign chart once per data and theme; each caller gets its own copy"""
+    return _build_campaign_chart(campaign_data, _theme_colors(theme)['text'])
+
+def create_campaign_chart(campaign_data):
+    """Create an interactive Plotly chart for campaign metrics"""
+    return _cached_campaign_chart(campaign_data, _resolved_theme())
+
+def _build_spend_waste_chart(waste_estimates, text_color):
+    """Build a stacked bar chart showing spend vs waste"""
+    # Extract data in one pass - campaigns missing either figure are dropped
+    waste_df = pd.DataFrame.from_dict(waste_estimates, orient='index')
+    waste_df = waste_df.reindex(columns=['total_spend', 'wasted_spend']).dropna()
     
     # Calculate effective spend (total - wasted)
-    effective_spend = [t - w for t, w in zip(total_spend, wasted_spend)]
+    campaigns = waste_df.index.to_numpy()
+    wasted_spend = waste_df['wasted_spend'].to_numpy(dtype=float)
+    effective_spend = waste_df['total_spend'].to_numpy(dtype=float) - wasted_spend
     
-    if not campaigns:
+    if waste_df.empty:
         # Handle empty data
-        fig = go.Figure()
-        text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
-        fig.update_layout(
-            title="No waste data available",
+        return _message_figure(
+            "No waste data available",
+            "Waste data could not be calculated or is empty",
+            text_color
+        )
+    
+    hovertemplate = "%{y}<br>%{x:$,.0f}<br>%{data.name}"
+    
+    # Build the figure from effective and wasted spend bars in one go
+    return go.Figure(
+        data=[
+            go.Bar(
+                y=campaigns,
+                x=effective_spend,
+                name='Effective Spend',
+                orientation='h',
+                marker=dict(color='#4CAF50'),
+                hovertemplate=hovertemplate
+            ),
+            go.Bar(
+                y=campaigns,
+                x=wasted_spend,
+                name='Wasted Spend',
+                orientation='h',
+                marker=dict(color='#F44336'),
+                hovertemplate=hovertemplate
+            )
+        ],
+        layout=dict(
+            barmode='stack',
+            title='Campaign Spend Efficiency',
+            xaxis=dict(
+                title='Spend ($)',
+                tickformat='$,.0f',
+                showgrid=True,
+                gridwidth=0.5,
+                gridcolor='rgba(150,150,150,0.1)',
+                zeroline=False
+            ),
+            yaxis=dict(
+                showgrid=False,
+                zeroline=False
+            ),
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            ),
             height=400,
+            margin=dict(l=10, r=10, t=50, b=10),
             plot_bgcolor='rgba(0,0,0,0)',
             paper_bgcolor='rgba(0,0,0,0)',
             font=dict(color=text_color)
         )
-        fig.add_annotation(
-            text="Waste data could not be calculated or is empty",
-            showarrow=False,
-            xref="paper", yref="paper",
-            x=0.5, y=0.5,
-            font=dict(size=14, color=text_color)
-        )
-        return fig
-    
-    # Create figure
-    fig = go.Figure()
-    
-    # Add effective spend bars
-    fig.add_trace(go.Bar(
-        y=campaigns,
-        x=effective_spend,
-        name='Effective Spend',
-        orientation='h',
-        marker=dict(color='#4CAF50')
-    ))
-    
-    # Add wasted spend bars
-    fig.add_trace(go.Bar(
-        y=campaigns,
-        x=wasted_spend,
-        name='Wasted Spend',
-        orientation='h',
-        marker=dict(color='#F44336')
-    ))
-    
-    # Update layout with theme-appropriate colors
-    text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
-    
-    fig.update_layout(
-        barmode='stack',
-        title='Campaign Spend Efficiency',
-        xaxis=dict(
-            title='Spend ($)',
-            tickformat='$,.0f'
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        ),
-        height=400,
-        margin=dict(l=10, r=10, t=50, b=10),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color=text_color)
     )
-    
-    # Update axes for better readability
-    fig.update_xaxes(
-        showgrid=True,
-        gridwidth=0.5,
-        gridcolor='rgba(150,150,150,0.1)',
-        zeroline=False
-    )
-    
-    fig.update_yaxes(
-        showgrid=False,
-        zeroline=False
-    )
-    
-    # Format hover template
-    fig.update_traces(
-        hovertemplate="%{y}<br>%{x:$,.0f}<br>%{data.name}"
+
+@st.cache_data(ttl=3600, max_entries=64)
+def _cached_spend_waste_chart(waste_estimates, theme):
+    """Build the spend vs waste chart once per data and theme; each caller gets its own copy"""
+    return _build_spend_waste_chart(waste_estimates, _theme_colors(theme)['text'])
+
+def create_spend_waste_chart(waste_estimates):
+    """Create a stacked bar chart showing spend vs waste"""
+    return _cached_spend_waste_chart(waste_estimates, _resolved_theme())
+
+# FRI gauge markup filled by _fri_gauge_html - a gradient arc with a needle and the score
+_GAUGE_HTML = """
+    <div style="text-align: center; margin-bottom: 20px;">
+        <svg viewBox="0 0 200 110" width="200" height="110" style="display: block; margin: 0 auto;">
+            <defs><linearGradient id="fri-gauge-gradient"><stop offset="0" stop-color="#4CAF50"/><stop offset="0.33" stop-color="#FFCA28"/><stop offset="0.67" stop-color="#FF9800"/><stop offset="1" stop-color="#F44336"/></linearGradient></defs>
+            <path d="M10 100 A90 90 0 0 1 190 100" fill="none" stroke="url(#fri-gauge-gradient)" stroke-width="20"/>
+            <line x1="{needle_x}" y1="80" x2="{needle_x}" y2="110" stroke="{status_color}" stroke-width="3"/>
+            <text x="100" y="95" text-anchor="middle" font-size="40" font-weight="bold" fill="{text_color}">{fri_score}</text>
+        </svg>
+        <div style="margin-top: 15px; font-size: 1.5rem; font-weight: bold; color: {status_color};">{status}</div>
+        <div style="margin-top: 5px; font-size: 1.2rem; color: {text_color};">Risk Level: {risk_level}</div>
+    </div>
+    """
+
+@lru_cache(maxsize=512)
+def _fri_gauge_html(status, fri_score, risk_level, theme):
+    """Render the FRI gauge once per distinct status, score, risk level and theme"""
+    # The needle sweeps the arc's 10-190 span as the score goes from 0 to 100
+    needle_x = 10 + 1.8 * min(max(float(fri_score), 0.0), 100.0)
+    return _GAUGE_HTML.format(
+        text_color=_theme_colors(theme)['text'],
+        status_color=STAGE_COLORS.get(status, '#9E9E9E'),
+        needle_x=f"{needle_x:.1f}",
+        fri_score=fri_score,
+        status=status,
+        risk_level=risk_level
     )
-    
-    return fig
 
 def enhance_fri_display(campaign_rec):
     """
@@ -302,57 +395,25 @@ def enhance_fri_display(campaign_rec):
     fri_score = campaign_rec['fri_score'] if 'fri_score' in campaign_rec else 0
     risk_level = campaign_rec['risk_level'] if 'risk_level' in campaign_rec else 'Unknown'
     
-    # Determine color based on status
-    status_color = {
-        'Healthy': '#4CAF50',
-        'Friction': '#FFCA28',
-        'Fatigue': '#FF9800',
-        'Failure': '#F44336',
-        'Unknown': '#9E9E9E'
-    }.get(status, '#9E9E9E')
-    
-    # Determine text color based on theme
-    text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
-    bg_color = '#262730' if st.session_state.get('theme', 'light') == 'dark' else '#ffffff'
-    
-    # Create a visual gauge for the FRI score
-    gauge_html = f"""
-    <div style="text-align: center; margin-bottom: 20px;">
-        <div style="position: relative; width: 200px; height: 100px; margin: 0 auto; overflow: hidden;">
-            <div style="position: absolute; width: 200px; height: 200px; border-radius: 100px; background: linear-gradient(90deg, #4CAF50, #FFCA28, #FF9800, #F44336); clip: rect(0px, 200px, 100px, 0px);"></div>
-            <div style="position: absolute; width: 160px; height: 160px; top: 20px; left: 20px; border-radius: 80px; background-color: {bg_color}; clip: rect(0px, 160px, 80px, 0px);"></div>
-            <div style="position: absolute; bottom: 5px; left: 100px; transform: translateX(-50%); font-size: 2.5rem; font-weight: bold; color: {text_color};">{fri_score}</div>
-            <div style="position: absolute; bottom: 0; left: {fri_score}%; width: 3px; height: 30px; background-color: {status_color}; transform: translateX(-50%);"></div>
-        </div>
-        <div style="margin-top: 15px; font-size: 1.5rem; font-weight: bold; color: {status_color};">{status}</div>
-        <div style="margin-top: 5px; font-size: 1.2rem; color: {text_color};">Risk Level: {risk_level}</div>
-    </div>
-    """
-    
-    return gauge_html
+    return _fri_gauge_html(status, fri_score, risk_level, _resolved_theme())
 
-def create_fri_heatmap(fri_data):
+def _build_fri_heatmap(fri_data, text_color):
     """
-    Create a heatmap visualization of FRI scores across campaigns and time
+    Build a heatmap visualization of FRI scores across campaigns and time
     """
-    if fri_data.empty:
-        return None
+    # plotly.express is heavy and only the heatmap needs it
+    import plotly.express as px
     
-    # Get unique campaigns and dates
-    campaigns = fri_data['campaign_id'].unique()
-    dates = pd.to_datetime(fri_data['date']).dt.strftime('%Y-%m-%d').unique()
+    # Format the dates once for the pivot columns
+    date_labels = _to_datetime(fri_data['date']).dt.strftime('%Y-%m-%d')
     
-    # Create a pivot table of FRI scores
-    pivot_data = fri_data.pivot_table(
-        index='campaign_id', 
-        columns=pd.to_datetime(fri_data['date']).dt.strftime('%Y-%m-%d'),
-        values='fri_score',
-        aggfunc='mean'
-    ).fillna(0)
+    # Average FRI scores per campaign and date, with missing days as 0
+    pivot_data = fri_data.groupby(['campaign_id', date_labels])['fri_score'].mean().unstack()
+    scores = np.nan_to_num(pivot_data.to_numpy(dtype=float), nan=0.0)
     
     # Create heatmap
     fig = px.imshow(
-        pivot_data,
+        scores,
         labels=dict(x="Date", y="Campaign", color="FRI Score"),
         x=pivot_data.columns,
         y=pivot_data.index,
@@ -366,7 +427,6 @@ def create_fri_heatmap(fri_data):
     )
     
     # Update layout
-    text_color = '#ffffff' if st.session_state.get('theme', 'light') == 'dark' else '#111111'
     fig.update_layout(
         title="FRI Score Heatmap",
         xaxis_title="Date",
@@ -379,31 +439,44 @@ def create_fri_heatmap(fri_data):
     
     return fig
 
+@st.cache_data(ttl=3600, max_entries=64)
+def _cached_fri_heatmap(fri_data, theme):
+    """Build the FRI heatmap once per data and theme; each caller gets its own copy"""
+    return _build_fri_heatmap(fri_data, _theme_colors(theme)['text'])
+
+def create_fri_heatmap(fri_data):
+    """
+    Create a heatmap visualization of FRI scores across campaigns and time
+    """
+    if fri_data.empty:
+        return None
+    
+    return _cached_fri_heatmap(fri_data, _resolved_theme())
+
+# Modules every tab needs, and whether this interpreter is recent enough
+REQUIRED_MODULES = ('streamlit', 'pandas', 'plotly', 'numpy')
+_PY_OK = sys.version_info >= (3, 7)
+
+@lru_cache(maxsize=None)
+def _missing_modules(modules):
+    """Return the modules that cannot be found - constant for the life of the process"""
+    return [m for m in modules if m not in sys.modules and importlib.util.find_spec(m) is None]
+
 def diagnose_tab_functionality(tab_name):
     """
     Helper function to diagnose tab functionality issues
     Returns a tuple of (is_ok, message)
     """
-    import sys
-    import importlib
-    
     try:
         # Check if required modules are available
-        required_modules = ['streamlit', 'pandas', 'plotly', 'numpy']
-        missing_modules = []
-        
-        for module in required_modules:
-            try:
-                importlib.import_module(module)
-            except ImportError:
-                missing_modules.append(module)
+        missing_modules = _missing_modules(REQUIRED_MODULES)
         
         if missing_modules:
             return False, f"Missing required modules: {', '.join(missing_modules)}"
         
         # Check Python version
-        py_version = sys.version_info
-        if py_version.major < 3 or (py_version.major == 3 and py_version.minor < 7):
+        if not _PY_OK:
+            py_version = sys.version_info
             return False, f"Python version {py_version.major}.{py_version.minor} may not be compatible. Python 3.7+ is recommended."
         
         # Check if theme is in session state